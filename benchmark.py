@@ -0,0 +1,240 @@
+"""
+에이전트/탐색 엔진 속도 벤치마크
+
+고정된 시드로 만든 국면 모음(초반/중반/후반)에서 다음을 측정해 JSON 으로 저장한다.
+- 에이전트별 select_piece / place_piece 지연 시간 p50/p95/p99, 최대 메모리
+- mcts() 의 초당 반복(롤아웃) 수, 초당 노드 수, 노드당 바이트
+- simulate / batch_simulate 의 초당 플레이아웃 수
+
+예: python benchmark.py --output bench.json
+    python benchmark.py --output new.json --compare bench.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from headless import load_agent
+from quarto_batch import batch_simulate
+from quarto_mcts import GameState, Node, mcts, simulate, tree_memory_usage
+from quarto_state import PIECES, QuartoState
+
+# 단계별 (이름, 놓인 말 수 범위)
+PHASES = (
+    ('opening', (0, 2)),
+    ('midgame', (6, 8)),
+    ('endgame', (10, 11)),
+)
+
+# 이름 -> (에이전트, 생성자 인자)
+DEFAULT_CONFIGS = {
+    'p1': ('machines_p1:P1', {}),
+    'p1-mcts': ('machines_p1_mcts:P1', {}),
+    'p1-timed': ('machines_p1:P1', {'time_per_move': 0.5}),
+    'p1-batch': ('machines_p1:P1', {'rollout_batch': 32, 'time_per_move': 0.5}),
+    'p2': ('machines_p2:P2', {}),
+}
+
+
+def make_corpus(positions_per_phase=4, seed=2024):
+    """
+    승부가 나지 않은 무작위 국면을 단계별로 만듦
+    각 항목: (단계, 보드 4x4 리스트, 남은 말 튜플 리스트, 놓을 말 튜플)
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for phase, (low, high) in PHASES:
+        made = 0
+        while made < positions_per_phase:
+            placed = rng.randint(low, high)
+            cells = rng.sample(range(16), placed)
+            order = rng.sample(range(16), 16)
+            state = QuartoState()
+            for cell, piece_id in zip(cells, order):
+                state = state.place(cell, piece_id)
+            if state.has_win():
+                continue
+            available = [PIECES[piece_id] for piece_id in order[placed:]]
+            corpus.append((phase, state.to_board(), available, PIECES[order[placed]]))
+            made += 1
+    return corpus
+
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+def bench_agent(spec, kwargs, corpus, repeat=1, measure_memory=True):
+    """
+    국면마다 새 에이전트로 select_piece / place_piece 를 호출해 지연 시간과 메모리 측정
+    """
+    agent_class = load_agent(spec)
+    latencies = {'select_piece': [], 'place_piece': []}
+    by_phase = {}
+    peak_memory = 0
+    for _ in range(repeat):
+        for phase, board, available, piece in corpus:
+            for method in ('select_piece', 'place_piece'):
+                agent = agent_class(board=np.array(board), available_pieces=available[:], **kwargs)
+                args = () if method == 'select_piece' else (piece,)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    begin = time.perf_counter()
+                    getattr(agent, method)(*args)
+                    elapsed = time.perf_counter() - begin
+                latencies[method].append(elapsed)
+                by_phase.setdefault(phase, []).append(elapsed)
+
+    if measure_memory:
+        # tracemalloc 은 느리므로 지연 시간과 따로 한 번 더 실행
+        for phase, board, available, piece in corpus:
+            for method in ('select_piece', 'place_piece'):
+                agent = agent_class(board=np.array(board), available_pieces=available[:], **kwargs)
+                args = () if method == 'select_piece' else (piece,)
+                tracemalloc.start()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    getattr(agent, method)(*args)
+                peak_memory = max(peak_memory, tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+
+    all_latencies = latencies['select_piece'] + latencies['place_piece']
+    result = {
+        'agent': spec,
+        'kwargs': kwargs,
+        'moves': len(all_latencies),
+        'latency_p50': percentile(all_latencies, 50),
+        'latency_p95': percentile(all_latencies, 95),
+        'latency_p99': percentile(all_latencies, 99),
+        'latency_by_method': {
+            method: {'p50': percentile(values, 50), 'p95': percentile(values, 95), 'p99': percentile(values, 99)}
+            for method, values in latencies.items()
+        },
+        'latency_p50_by_phase': {phase: percentile(values, 50) for phase, values in by_phase.items()},
+    }
+    if measure_memory:
+        result['peak_memory_bytes'] = peak_memory
+    return result
+
+
+def bench_engine(corpus, simulation_count=2000):
+    """
+    mcts() 를 직접 실행해 초당 반복 수(= 리프 롤아웃 수), 초당 노드 수, 노드당 바이트 측정
+    """
+    iterations = 0
+    nodes = 0
+    total_bytes = 0
+    elapsed = 0.0
+    for _, board, available, piece in corpus:
+        board_state = QuartoState.from_board(board, available)
+        for state in (GameState(board_state), GameState(board_state, selected=PIECES.index(piece))):
+            root = Node(state)
+            begin = time.perf_counter()
+            mcts(state, simulation_count=simulation_count, root=root)
+            elapsed += time.perf_counter() - begin
+            usage = tree_memory_usage(root)
+            iterations += simulation_count
+            nodes += usage['nodes']
+            total_bytes += usage['bytes']
+    return {
+        'simulation_count': simulation_count,
+        'rollouts_per_sec': iterations / elapsed,
+        'nodes_per_sec': nodes / elapsed,
+        'bytes_per_node': total_bytes / max(1, nodes),
+    }
+
+
+def bench_rollouts(corpus, count=2000, batch_size=256):
+    """
+    단일 플레이아웃(simulate)과 배치 플레이아웃(batch_simulate)의 초당 플레이아웃 수
+    """
+    states = [GameState(QuartoState.from_board(board, available)) for _, board, available, _ in corpus]
+    begin = time.perf_counter()
+    for state in states:
+        for _ in range(count):
+            simulate(state, 0)
+    scalar = len(states) * count / (time.perf_counter() - begin)
+
+    rng = np.random.default_rng(0)
+    begin = time.perf_counter()
+    for state in states:
+        for _ in range(max(1, count // batch_size)):
+            batch_simulate(state, 0, batch_size, rng)
+    batched = len(states) * max(1, count // batch_size) * batch_size / (time.perf_counter() - begin)
+    return {'simulate_per_sec': scalar, 'batch_simulate_per_sec': batched, 'batch_size': batch_size}
+
+
+def compare(current, baseline):
+    """
+    기준 결과 대비 변화율을 출력 (지연 시간은 낮을수록, 처리량은 높을수록 좋음)
+    """
+    lines = []
+    for name, result in current['agents'].items():
+        old = baseline.get('agents', {}).get(name)
+        if old is None:
+            continue
+        for key in ('latency_p50', 'latency_p95', 'latency_p99', 'peak_memory_bytes'):
+            if key in result and key in old and old[key]:
+                lines.append(f"{name:10s} {key:18s} {old[key]:12.4f} -> {result[key]:12.4f} ({result[key] / old[key] - 1:+.1%})")
+    for section in ('engine', 'rollouts'):
+        for key, value in current.get(section, {}).items():
+            old = baseline.get(section, {}).get(key)
+            if key.endswith('_per_sec') and old:
+                lines.append(f"{section:10s} {key:18s} {old:12.1f} -> {value:12.1f} ({value / old - 1:+.1%})")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Quarto agents and search engine")
+    parser.add_argument('--config', action='append', choices=sorted(DEFAULT_CONFIGS),
+                        help="agent configuration to run (repeatable, default: all)")
+    parser.add_argument('--positions', type=int, default=4, help="positions per phase")
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--simulations', type=int, default=2000, help="mcts() iterations per engine position")
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc pass")
+    parser.add_argument('--output', help="write results as JSON")
+    parser.add_argument('--compare', help="baseline JSON to compare against")
+    args = parser.parse_args(argv)
+
+    corpus = make_corpus(args.positions)
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'positions': len(corpus),
+        },
+        'engine': bench_engine(corpus, args.simulations),
+        'rollouts': bench_rollouts(corpus),
+        'agents': {},
+    }
+    for name in args.config or sorted(DEFAULT_CONFIGS):
+        spec, kwargs = DEFAULT_CONFIGS[name]
+        results['agents'][name] = bench_agent(spec, kwargs, corpus, args.repeat, not args.no_memory)
+        result = results['agents'][name]
+        print(f"{name:10s} p50 {result['latency_p50']:.3f}s  p95 {result['latency_p95']:.3f}s  "
+              f"p99 {result['latency_p99']:.3f}s  peak {result.get('peak_memory_bytes', 0) / 1e6:.1f}MB")
+    engine = results['engine']
+    print(f"engine     {engine['rollouts_per_sec']:.0f} rollouts/s  {engine['nodes_per_sec']:.0f} nodes/s  "
+          f"{engine['bytes_per_node']:.0f} B/node")
+    rollouts = results['rollouts']
+    print(f"rollouts   simulate {rollouts['simulate_per_sec']:.0f}/s  batch {rollouts['batch_simulate_per_sec']:.0f}/s")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        for line in compare(results, baseline):
+            print(line)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+pygame 없이 두 에이전트의 대국을 진행하는 심판
+
+main.py 의 게임 루프와 같은 순서로 진행한다: 상대(3-turn)가 말을 골라 주면
+turn 플레이어가 놓고, 승리/무승부가 아니면 차례를 넘긴다. 에이전트는 main.py 처럼
+한 게임 동안 유지되며 같은 board / available_pieces 객체를 읽는다.
+"""
+import importlib
+import time
+
+from quarto_game import QuartoGame
+
+
+def load_agent(spec):
+    """
+    'module:Class' 형식 (예: 'machines_p1:P1') 으로 에이전트 클래스 로드
+    """
+    module_name, _, class_name = spec.partition(':')
+    module = importlib.import_module(module_name)
+    return getattr(module, class_name or 'P1')
+
+
+def play_game(players, agent_kwargs=None):
+    """
+    players = {1: 클래스, 2: 클래스} 로 한 게임을 진행하고 결과 dict 반환
+
+    winner: 1 / 2 / None (무승부). 잘못된 말이나 칸을 고르면 상대 승리로 처리한다.
+    """
+    agent_kwargs = agent_kwargs or {1: {}, 2: {}}
+    game = QuartoGame()
+    agents = {
+        turn: players[turn](board=game.board, available_pieces=game.available_pieces, **agent_kwargs[turn])
+        for turn in players
+    }
+    try:
+        return _play(game, agents)
+    finally:
+        # 병렬 탐색 워커 등 에이전트가 잡은 자원 정리
+        for agent in agents.values():
+            close = getattr(agent, 'close', None)
+            if close is not None:
+                close()
+
+
+def _play(game, agents):
+    total_time_consumption = {1: 0.0, 2: 0.0}
+    moves = 0
+    turn = 1
+    while True:
+        begin = time.time()
+        selected_piece = agents[3 - turn].select_piece()
+        total_time_consumption[3 - turn] += time.time() - begin
+        if selected_piece not in game.available_pieces:
+            return {'winner': turn, 'forfeit': 3 - turn, 'moves': moves, 'time': total_time_consumption}
+
+        begin = time.time()
+        board_row, board_col = agents[turn].place_piece(selected_piece)
+        total_time_consumption[turn] += time.time() - begin
+        if not game.available_square(board_row, board_col):
+            return {'winner': 3 - turn, 'forfeit': turn, 'moves': moves, 'time': total_time_consumption}
+
+        game.place(board_row, board_col, selected_piece)
+        moves += 1
+        game_over, winner = game.outcome(board_row, board_col, turn)
+        if game_over:
+            return {'winner': winner, 'forfeit': None, 'moves': moves, 'time': total_time_consumption}
+        turn = 3 - turn
@@ -1,12 +1,13 @@
 
 import sys
 import pygame
-import numpy as np
 
 from machines_p1 import P1
 from machines_p2 import P2
 import time
 
+from quarto_game import QuartoGame
+
 players = {
     1: P1,
     2: P2
@@ -36,16 +37,23 @@ screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption('MBTI Quarto')
 screen.fill(BLACK)
 
-# Initialize board and pieces
-board = np.zeros((BOARD_ROWS, BOARD_COLS), dtype=int)
+# Initialize board and pieces (board / available_pieces / 비트보드는 game 이 유지)
+game = QuartoGame()
+board = game.board
 
 # MBTI Pieces (Binary Encoding: I/E = 0/1, N/S = 0/1, T/F = 0/1, P/J = 0/1)
 pieces = [(i, j, k, l) for i in range(2) for j in range(2) for k in range(2) for l in range(2)]  # All 16 pieces
-available_pieces = pieces[:]
+available_pieces = game.available_pieces
 
 # Global variable for selected piece
 selected_piece = None
 
+# Agents persist for a whole game so they can keep their search trees
+def create_agents():
+    return {turn: players[turn](board=board, available_pieces=available_pieces) for turn in players}
+
+agents = create_agents()
+
 # Helper functions
 def draw_lines(color=WHITE):
     for i in range(1, BOARD_ROWS):
@@ -81,62 +89,15 @@ def draw_available_pieces():
         y_pos = WIDTH + (row * PIECE_SIZE) + 10
         screen.blit(text_surface, (x_pos, y_pos))
 
-def available_square(row, col):
-    return board[row][col] == 0
-
-def is_board_full():
-    for row in range(BOARD_ROWS):
-        for col in range(BOARD_COLS):
-            if board[row][col] == 0:
-                return False
-    return True
-
-def check_line(line):
-    if 0 in line:
-        return False  # Incomplete line
-    characteristics = np.array([pieces[piece_idx - 1] for piece_idx in line])
-    for i in range(4):  # Check each characteristic (I/E, N/S, T/F, P/J)
-        if len(set(characteristics[:, i])) == 1:  # All share the same characteristic
-            return True
-    return False
-
-def check_2x2_subgrid_win():
-    for r in range(BOARD_ROWS - 1):
-        for c in range(BOARD_COLS - 1):
-            subgrid = [board[r][c], board[r][c+1], board[r+1][c], board[r+1][c+1]]
-            if 0 not in subgrid:  # All cells must be filled
-                characteristics = [pieces[idx - 1] for idx in subgrid]
-                for i in range(4):  # Check each characteristic (I/E, N/S, T/F, P/J)
-                    if len(set(char[i] for char in characteristics)) == 1:  # All share the same characteristic
-                        return True
-    return False
-
-def check_win():
-    # Check rows, columns, and diagonals
-    for col in range(BOARD_COLS):
-        if check_line([board[row][col] for row in range(BOARD_ROWS)]):
-            return True
-    
-    for row in range(BOARD_ROWS):
-        if check_line([board[row][col] for col in range(BOARD_COLS)]):
-            return True
-        
-    if check_line([board[i][i] for i in range(BOARD_ROWS)]) or check_line([board[i][BOARD_ROWS - i - 1] for i in range(BOARD_ROWS)]):
-        return True
-
-    # Check 2x2 sub-grids
-    if check_2x2_subgrid_win():
-        return True
-    
-    return False
-
 def restart_game():
-    global board, available_pieces, selected_piece, player
+    global game, board, available_pieces, selected_piece, player, agents
     screen.fill(BLACK)
     draw_lines()
-    board = np.zeros((BOARD_ROWS, BOARD_COLS), dtype=int)
-    available_pieces = pieces[:]
+    game = QuartoGame()
+    board = game.board
+    available_pieces = game.available_pieces
     selected_piece = None  # Reset selected piece
+    agents = create_agents()
     draw_available_pieces()
     display_message(f"Player {player}'s turn")
 
@@ -191,7 +152,7 @@ while True:
 
             if pressed[pygame.K_SPACE]:
                 begin = time.time()
-                player = players[3-turn](board=board, available_pieces=available_pieces)
+                player = agents[3-turn]
                 selected_piece = player.select_piece()
                 finish = time.time()
                 total_time_consumption[3-turn]+=(finish-begin)
@@ -202,24 +163,18 @@ while True:
 
             if pressed[pygame.K_SPACE]:
                 begin = time.time()
-                player = players[turn](board=board, available_pieces=available_pieces)
+                player = agents[turn]
                 (board_row, board_col) = player.place_piece(selected_piece)
                 finish = time.time()
                 total_time_consumption[turn]+=(finish-begin)
 
-                if available_square(board_row, board_col):
+                if game.available_square(board_row, board_col):
                     # Place the selected piece on the board
-                    board[board_row][board_col] = pieces.index(selected_piece) + 1
-                    available_pieces.remove(selected_piece)
+                    game.place(board_row, board_col, selected_piece)
                     selected_piece = None
 
-                    if check_win():
-                        game_over = True
-                        winner = turn
-                    elif is_board_full():
-                        game_over = True
-                        winner = None
-                    else:
+                    game_over, winner = game.outcome(board_row, board_col, turn)
+                    if not game_over:
                         turn = 3 - turn
                         flag = "select_piece"
                 else:
@@ -248,7 +203,7 @@ while True:
             if winner:
                 display_message(f"Player {winner} Wins!", GREEN)
                 display_time(total_time_consumption)
-            elif is_board_full():
+            elif game.is_board_full():
                 display_message("Draw!", GRAY)
                 display_time(total_time_consumption)
 
@@ -0,0 +1,177 @@
+import os
+import time
+
+from quarto_batch import BatchRollout
+from quarto_book import DEFAULT_BOOK_PATH, OpeningBook
+from quarto_eval import HeuristicEvaluator
+from quarto_mcts import (
+    ROLLOUT_POLICIES, GameState, Node, PUCTNode, SearchStats, TranspositionTable, mcts, move_time_limit, puct_mcts,
+    reuse_subtree,
+)
+from quarto_model import PolicyValueModel
+from quarto_parallel import RootParallelMCTS, TreeParallelMCTS
+from quarto_solver import EndgameSolver
+from quarto_state import PIECES, QuartoState, cell_to_rc, piece_index
+
+
+class MCTSAgent:
+    """
+    main.py 의 에이전트 인터페이스 (select_piece / place_piece) 를 구현하는 MCTS 에이전트
+
+    machines_p1.py / machines_p1_mcts.py / machines_p2_mcts.py 의 P1 은 이 클래스에
+    UCT 탐색 상수 exploration_weight 기본값만 다르게 준다.
+    """
+    def __init__(self, board, available_pieces, exploration_weight=1.4, time_per_move=None, remaining_time=None,
+                 solver_threshold=8, solver_time_limit=3.0, workers=1, parallel='root',
+                 rollout_batch=0, stats_path=None, book_path=DEFAULT_BOOK_PATH,
+                 heuristic=False, simulation_count=10000,
+                 model_path=None, leaf_batch=16, rollout_policy='random',
+                 rave=0):
+        self.pieces = [(i, j, k, l) for i in range(2) for j in range(2) for k in range(2) for l in range(2)]  # 16개의 모든 말
+        self.board = board  # 현재 보드 상태 (0: 빈칸, 1~16: 배치된 말의 인덱스)
+        self.available_pieces = available_pieces  # 현재 사용 가능한 말들 (튜플 형태)
+        self.time_per_move = time_per_move  # 한 수에 쓸 최대 시간 (초, None: 고정 시뮬레이션 횟수)
+        self.remaining_time = remaining_time  # 게임에서 남은 전체 시간 (초)
+        self.simulation_count = simulation_count  # 시간 제한이 없을 때 한 수의 시뮬레이션 횟수
+        self.exploration_weight = exploration_weight  # UCT 탐색 상수
+        self.root = None  # 이전 수에서 고른 행동의 탐색 트리 노드
+        self.root_state = None  # self.root 의 상태 (노드는 상태를 저장하지 않음)
+        self.table = TranspositionTable()  # 게임 동안 유지하는 트랜스포지션 테이블
+        self.solver = EndgameSolver()  # 후반 완전 탐색
+        self.solver_threshold = solver_threshold  # 빈칸이 이 값 이하이면 완전 탐색
+        self.solver_time_limit = solver_time_limit  # 완전 탐색 최대 시간 (초)
+        self.workers = workers  # 2 이상이면 병렬 MCTS 에 쓸 프로세스 수
+        self.parallel_mode = parallel  # 'root': 루트 병렬 / 'tree': 공유 트리 병렬
+        self.parallel = None
+        # 1 이상이면 리프마다 NumPy 배치 플레이아웃 rollout_batch 개의 평균으로 평가
+        # 아니면 rollout_policy 의 플레이아웃 1회 ('random': 무작위, 'tactical': 바로 이기는 수는 두고
+        # 바로 지는 말은 주지 않음)
+        self.evaluate = BatchRollout(rollout_batch) if rollout_batch > 0 else ROLLOUT_POLICIES[rollout_policy]
+        if heuristic:
+            # 플레이아웃 대신 라인 상태의 정적 평가로 리프를 평가
+            self.evaluate = HeuristicEvaluator()
+        self.rave = rave  # 0 보다 크면 단일 프로세스 MCTS 에서 RAVE (AMAF) 통계를 섞음
+        self.stats_path = stats_path  # 주면 수마다 탐색 통계를 JSON 한 줄씩 덧붙임
+        self.last_stats = None  # 마지막 MCTS 탐색의 SearchStats (stats_path 가 있을 때만)
+        self.last_visits = {}  # 마지막 수의 루트 자식별 방문 횟수 (북/풀이기의 수는 {행동: 1})
+        # 주면 정책/가치 모델을 사전 확률과 리프 값으로 쓰는 PUCT 탐색 사용
+        self.model = PolicyValueModel.load(model_path) if model_path else None
+        self.leaf_batch = leaf_batch  # PUCT 에서 모델을 한 번에 호출할 리프 수
+        # 오프닝 북 (파일이 없으면 사용하지 않음)
+        self.book = OpeningBook(book_path) if book_path and os.path.exists(book_path) else None
+
+    def search(self, state):
+        begin = time.time()
+        num_empty = state.board.num_empty()
+        time_limit = move_time_limit(num_empty, self.remaining_time, self.time_per_move)
+
+        # 초반에는 오프닝 북의 수를 바로 사용
+        action = self.book.lookup(state) if self.book is not None else None
+        if action is not None:
+            self.root = None
+        # 후반에는 끝까지 읽어서 이기거나 비기는 수를 바로 사용
+        elif num_empty <= self.solver_threshold:
+            solver_time_limit = self.solver_time_limit if time_limit is None else min(time_limit, self.solver_time_limit)
+            result = self.solver.solve(state, time_limit=solver_time_limit)
+            # 시간 초과이거나 지는 상태이면 (상대 실수를 노리도록) MCTS 로 넘어감
+            if result is not None and result[0] >= 0:
+                action = result[1]
+                self.root = None
+            elif time_limit is not None:
+                time_limit = max(0.0, time_limit - (time.time() - begin))
+
+        if action is None:
+            action = self.run_mcts(state, time_limit)
+        else:
+            self.last_visits = {action: 1}
+
+        if self.remaining_time is not None:
+            self.remaining_time -= time.time() - begin
+        return action
+
+    def run_mcts(self, state, time_limit):
+        simulation_count = self.simulation_count if time_limit is None else None
+
+        if self.model is not None:
+            # 모델이 있으면 플레이아웃 없는 PUCT 탐색 (트리는 수마다 새로 만듦)
+            root = PUCTNode()
+            action = puct_mcts(state, self.model, simulation_count=simulation_count, time_limit=time_limit,
+                               root=root, root_symmetry=True, batch_size=self.leaf_batch)
+            self.last_visits = {child_action: child.visits for child_action, child in (root.children or {}).items()}
+            self.root = None
+            return action
+
+        if self.workers > 1:
+            # 프로세스마다 독립 탐색 후 루트 통계를 합치거나 공유 트리를 함께 키움
+            # (트리가 워커/공유 메모리에 있으므로 재사용하지 않음)
+            if self.parallel is None:
+                if self.parallel_mode == 'tree':
+                    self.parallel = TreeParallelMCTS(self.workers)
+                else:
+                    self.parallel = RootParallelMCTS(self.workers)
+            self.root = None
+            action = self.parallel.search(state, simulation_count=simulation_count, time_limit=time_limit,
+                                          max_depth=7, exploration_weight=self.exploration_weight,
+                                          root_symmetry=True, evaluate=self.evaluate)
+            self.last_visits = {child_action: visits for child_action, (visits, _) in self.parallel.last_stats.items()}
+            return action
+
+        # 같은 게임에서 계속 사용되면 이전 탐색 트리 중 현재 상태의 부분 트리를 이어서 사용
+        root = reuse_subtree(self.root, self.root_state, state) if self.root is not None else None
+        if root is None:
+            root = self.table.get(state.hash_key()) or Node(state)
+
+        # 시간 제한이 있으면 제한 시간까지, 없으면 고정 횟수만큼 탐색
+        stats = SearchStats() if self.stats_path is not None else None
+        action = mcts(state, simulation_count=simulation_count, max_depth=7,
+                      exploration_weight=self.exploration_weight, time_limit=time_limit, root=root,
+                      transposition_table=self.table, root_symmetry=True, evaluate=self.evaluate, stats=stats,
+                      rave=self.rave)
+        if stats is not None:
+            self.last_stats = stats
+            stats.dump_json(self.stats_path, num_empty=state.board.num_empty(),
+                            phase='select' if state.selected < 0 else 'place', action=action)
+
+        self.last_visits = {child_action: child.visits for child_action, child in (root.children or {}).items()}
+        # 확장 전에 시간이 다 되어 무작위로 고른 행동이면 이어서 쓸 트리가 없음
+        self.root = root.children.get(action) if root.children else None
+        if self.root is not None:
+            self.root.parent = None
+            self.root_state = state.perform_action(action)
+        return action
+
+    def close(self):
+        """
+        병렬 탐색의 워커 프로세스 (트리 병렬이면 공유 메모리도) 를 정리. 게임이 끝나면 호출한다.
+        """
+        if getattr(self, 'parallel', None) is not None:
+            self.parallel.close()
+            self.parallel = None
+
+    def __del__(self):
+        self.close()
+
+    def select_piece(self):
+       
+        start_time = time.time()
+        
+        # 상대에게 줄 말을 고르는 단계에서 시작하는 게임 상태
+        state = GameState(QuartoState.from_board(self.board, self.available_pieces))
+        selected_piece = PIECES[self.search(state)]
+        
+        end_time = time.time()
+        print(f"select_piece 시간 소요: {end_time - start_time:.2f}s")
+        return selected_piece
+
+    def place_piece(self, selected_piece):
+       
+        start_time = time.time()
+        
+        # 받은 말을 놓는 단계에서 시작하는 게임 상태
+        board_state = QuartoState.from_board(self.board, self.available_pieces)
+        state = GameState(board_state, selected=piece_index(selected_piece))
+        best_location = cell_to_rc(self.search(state))
+        
+        end_time = time.time()
+        print(f"place_piece 시간 소요: {end_time - start_time:.2f}s")
+        return best_location
@@ -0,0 +1,106 @@
+"""
+NumPy 로 여러 개의 무작위 플레이아웃을 한 번에 진행하는 배치 시뮬레이터
+
+플레이아웃 K 개의 보드를 (K, 16) uint8 행렬로 두고 말 선택/배치와 승리 검사를
+K 개에 대해 한꺼번에 계산한다. 칸 값은 piece_id | (piece_id ^ 15) << 4 (빈칸 0) 이라
+라인 네 칸의 AND 가 0 이 아니면 네 말이 어떤 특성을 모두 1(하위 4비트) 또는 모두 0
+(상위 4비트)으로 공유한다는 뜻이고, 빈칸이 있으면 AND 는 항상 0 이다.
+"""
+import numpy as np
+
+from quarto_mcts import DRAW_REWARD
+from quarto_state import CELL_LINES, NUM_CELLS, NUM_PIECES, WIN_LINES, iter_bits
+
+_EMPTY_CELL = NUM_CELLS  # 항상 0 인 보조 칸 (라인 수를 맞추기 위한 채움용)
+
+# 말 piece_id 의 칸 값
+CELL_VALUES = np.array([piece_id | ((piece_id ^ 15) << 4) for piece_id in range(NUM_PIECES)], dtype=np.uint8)
+
+# LINE_CELLS[l]: 라인 l 의 네 칸
+LINE_CELLS = np.array([list(iter_bits(line)) for line in WIN_LINES], dtype=np.int64)
+
+
+def _cell_line_cells():
+    # 칸마다 그 칸을 지나는 라인들의 네 칸 (라인 수가 적은 칸은 보조 칸 라인으로 채움)
+    width = max(len(lines) for lines in CELL_LINES)
+    table = np.full((NUM_CELLS, width, 4), _EMPTY_CELL, dtype=np.int64)
+    for cell in range(NUM_CELLS):
+        for i, (line, _) in enumerate(CELL_LINES[cell]):
+            table[cell, i] = list(iter_bits(line))
+    return table
+
+
+CELL_LINE_CELLS = _cell_line_cells()  # (16, 7, 4)
+
+
+def _random_choice(mask, rng):
+    # 각 행에서 True 인 열 하나를 균등하게 고름
+    scores = rng.random(mask.shape, dtype=np.float32)
+    return np.where(mask, scores, -1.0).argmax(axis=1)
+
+
+def batch_simulate(state, player, count, rng=None):
+    """
+    GameState 에서 무작위 플레이아웃 count 개를 동시에 진행하고
+    player 관점 보상 배열 (승리 1, 무승부 0.5, 패배 0) 반환
+    """
+    if state.is_terminal():
+        return np.full(count, state.get_reward(player))
+    if rng is None:
+        rng = np.random.default_rng()
+
+    board = state.board
+    boards = np.zeros((count, NUM_CELLS + 1), dtype=np.uint8)
+    for cell in iter_bits(board.occupied):
+        boards[:, cell] = CELL_VALUES[board.piece_at(cell)]
+    available = np.zeros((count, NUM_PIECES), dtype=bool)
+    available[:, list(iter_bits(board.available))] = True
+    selected = np.full(count, state.selected, dtype=np.int64)
+    turn = np.full(count, state.player, dtype=np.int64)
+    rows = np.arange(count)
+    done = np.zeros(count, dtype=bool)
+    rewards = np.full(count, DRAW_REWARD)
+
+    for _ in range(board.num_empty()):
+        active = ~done
+        # 말 선택: 고른 플레이어의 상대가 놓음
+        choosing = active & (selected < 0)
+        if choosing.any():
+            pieces = _random_choice(available, rng)
+            selected = np.where(choosing, pieces, selected)
+            turn = np.where(choosing, 1 - turn, turn)
+
+        # 배치 (끝난 플레이아웃은 보조 칸에 0 을 써서 그대로 둠)
+        cells = _random_choice(boards[:, :NUM_CELLS] == 0, rng)
+        cells = np.where(active, cells, _EMPTY_CELL)
+        pieces = np.maximum(selected, 0)
+        boards[rows, cells] = np.where(active, CELL_VALUES[pieces], 0)
+        available[rows[active], pieces[active]] = False
+        selected = np.where(active, -1, selected)
+
+        # 방금 놓은 칸을 지나는 라인만 검사
+        line_values = boards[rows[:, None, None], CELL_LINE_CELLS[np.minimum(cells, NUM_CELLS - 1)]]
+        won = active & np.bitwise_and.reduce(line_values, axis=2).any(axis=1)
+        rewards = np.where(won, (turn == player).astype(float), rewards)
+        done |= won | boards[:, :NUM_CELLS].all(axis=1)
+        if done.all():
+            break
+    return rewards
+
+
+class BatchRollout:
+    """
+    MCTS 리프 평가 함수: 리프마다 플레이아웃 count 개를 배치로 진행한 평균 보상
+    """
+    def __init__(self, count=64, seed=None):
+        self.count = count
+        self.rng = np.random.default_rng(seed)
+
+    def reseed(self, seed):
+        """
+        워커 프로세스마다 다른 난수열을 쓰도록 발생기를 새로 만듦 (pickle 로 복사된 상태는 모두 같음)
+        """
+        self.rng = np.random.default_rng(seed)
+
+    def __call__(self, state, player):
+        return float(batch_simulate(state, player, self.count, self.rng).mean())
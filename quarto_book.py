@@ -0,0 +1,217 @@
+"""
+오프라인으로 만드는 오프닝 북
+
+초반 (놓인 말이 max_placed 개 이하) 의 정규 상태를 모두 나열해 깊게 탐색하고,
+정규 상태 해시 -> 정규 좌표의 행동을 정렬된 배열로 디스크에 저장한다.
+에이전트는 파일을 메모리 매핑해 이진 탐색으로 바로 수를 찾는다.
+
+파일 형식 (리틀 엔디언): 헤더 (매직 4바이트, 버전, 매개변수, 항목 수),
+정렬된 uint64 해시 배열, 같은 순서의 uint16 값 배열.
+값은 하위 4비트가 행동, 그 위 2비트가 값 코드(패/무/승/모름) 이다.
+
+예: python quarto_book.py --output opening_book.bin --max-placed 1 --simulations 100000 -j 4
+"""
+import argparse
+import os
+import random
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from quarto_mcts import GameState, Node, TranspositionTable, mcts
+from quarto_state import NUM_CELLS, QuartoState
+from quarto_symmetry import (
+    canonical_actions, canonical_hash, inverse_transform_cell, inverse_transform_piece, transform_cell,
+    transform_piece,
+)
+
+HEADER = struct.Struct('<4sHHQ')  # 매직, 버전, 매개변수, 항목 수
+FORMAT_VERSION = 1
+BOOK_MAGIC = b'QBK1'
+DEFAULT_BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'opening_book.bin')
+
+# 값 코드 (게임 이론 값 -1/0/1 은 +1 해서 저장)
+VALUE_LOSS = 0
+VALUE_DRAW = 1
+VALUE_WIN = 2
+VALUE_UNKNOWN = 3  # 탐색으로만 고른 수
+
+
+def pack_entry(action, value_code=VALUE_UNKNOWN):
+    return action | (value_code << 4)
+
+
+def unpack_entry(entry):
+    """
+    (행동, 값 코드) 반환
+    """
+    return entry & 15, (entry >> 4) & 3
+
+
+def write_table(path, magic, param, entries):
+    """
+    {해시: 값} 을 정렬해 path 에 저장 (임시 파일에 쓴 뒤 교체)
+    """
+    keys = np.array(sorted(entries), dtype='<u8')
+    values = np.array([entries[int(key)] for key in keys], dtype='<u2')
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(HEADER.pack(magic, FORMAT_VERSION, param, len(keys)))
+        f.write(keys.tobytes())
+        f.write(values.tobytes())
+    os.replace(temp_path, path)
+
+
+class PackedTable:
+    """
+    write_table 로 만든 파일을 처음 조회할 때 메모리 매핑해 읽음
+    """
+    def __init__(self, path, magic):
+        self.path = path
+        self.magic = magic
+        self.keys = None
+        self.values = None
+        self._param = None
+
+    def _open(self):
+        with open(self.path, 'rb') as f:
+            magic, version, param, size = HEADER.unpack(f.read(HEADER.size))
+        if magic != self.magic or version != FORMAT_VERSION:
+            raise ValueError(f"{self.path}: not a {self.magic.decode()} v{FORMAT_VERSION} table")
+        self._param = param
+        if size == 0:
+            self.keys = np.empty(0, dtype='<u8')
+            self.values = np.empty(0, dtype='<u2')
+            return
+        self.keys = np.memmap(self.path, dtype='<u8', mode='r', offset=HEADER.size, shape=(size,))
+        self.values = np.memmap(self.path, dtype='<u2', mode='r', offset=HEADER.size + 8 * size, shape=(size,))
+
+    @property
+    def param(self):
+        if self.keys is None:
+            self._open()
+        return self._param
+
+    def get(self, key):
+        """
+        key 의 값 (없으면 None)
+        """
+        if self.keys is None:
+            self._open()
+        index = int(np.searchsorted(self.keys, np.uint64(key)))
+        if index < len(self.keys) and int(self.keys[index]) == key:
+            return int(self.values[index])
+        return None
+
+    def __len__(self):
+        if self.keys is None:
+            self._open()
+        return len(self.keys)
+
+
+def to_canonical_action(state, action, transform):
+    return transform_piece(action, transform) if state.selected < 0 else transform_cell(action, transform)
+
+
+def from_canonical_action(state, action, transform):
+    return inverse_transform_piece(action, transform) if state.selected < 0 else inverse_transform_cell(action, transform)
+
+
+class OpeningBook:
+    """
+    에이전트용 오프닝 북 조회 (매개변수 = 북에 담긴 최대 놓인 말 수)
+    """
+    def __init__(self, path=DEFAULT_BOOK_PATH):
+        self.table = PackedTable(path, BOOK_MAGIC)
+
+    def lookup(self, state):
+        """
+        GameState 에서 둘 행동 (북에 없으면 None)
+        """
+        if NUM_CELLS - state.board.num_empty() > self.table.param:
+            return None
+        key, transform = canonical_hash(state.board, state.selected)
+        entry = self.table.get(key)
+        if entry is None:
+            return None
+        action = from_canonical_action(state, unpack_entry(entry)[0], transform)
+        if not (state.action_mask() >> action) & 1:
+            return None
+        return action
+
+
+def book_positions(max_placed=1):
+    """
+    처음 상태에서 놓인 말이 max_placed 개 이하인 정규 상태를 모두 나열
+    반환: [(해시, 변환, GameState)]
+    """
+    positions = {}
+    frontier = [GameState(QuartoState())]
+    while frontier:
+        next_frontier = []
+        for state in frontier:
+            key, transform = canonical_hash(state.board, state.selected)
+            if key in positions:
+                continue
+            positions[key] = (key, transform, state)
+            for action in canonical_actions(state):
+                child = state.perform_action(action)
+                if not child.is_terminal() and NUM_CELLS - child.board.num_empty() <= max_placed:
+                    next_frontier.append(child)
+        frontier = next_frontier
+    return list(positions.values())
+
+
+def _book_worker(args):
+    state, seed, simulation_count, mcts_kwargs = args
+    random.seed(seed)
+    return mcts(state, simulation_count=simulation_count, root=Node(state),
+                transposition_table=TranspositionTable(), root_symmetry=True, **mcts_kwargs)
+
+
+def build_book(max_placed=1, simulation_count=100000, workers=1, seed=0, verbose=False, **mcts_kwargs):
+    """
+    초반 정규 상태마다 mcts() 로 수를 골라 {해시: 값} 반환
+    """
+    positions = book_positions(max_placed)
+    tasks = [(state, seed + i, simulation_count, mcts_kwargs) for i, (_, _, state) in enumerate(positions)]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            actions = list(executor.map(_book_worker, tasks))
+    else:
+        actions = []
+        for i, task in enumerate(tasks):
+            begin = time.time()
+            actions.append(_book_worker(task))
+            if verbose:
+                print(f"{i + 1}/{len(tasks)}: {time.time() - begin:.1f}s")
+    return {
+        key: pack_entry(to_canonical_action(state, action, transform))
+        for (key, transform, state), action in zip(positions, actions)
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the Quarto opening book")
+    parser.add_argument('--output', default=DEFAULT_BOOK_PATH)
+    parser.add_argument('--max-placed', type=int, default=1, help="deepest position in the book (pieces on board)")
+    parser.add_argument('--simulations', type=int, default=100000, help="mcts() iterations per position")
+    parser.add_argument('--max-depth', type=int, default=16)
+    parser.add_argument('-j', '--jobs', type=int, default=1, help="number of parallel processes")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-v', '--verbose', action='store_true')
+    args = parser.parse_args(argv)
+
+    begin = time.time()
+    entries = build_book(args.max_placed, args.simulations, args.jobs, args.seed, args.verbose,
+                         max_depth=args.max_depth)
+    write_table(args.output, BOOK_MAGIC, args.max_placed, entries)
+    print(f"{len(entries)} positions -> {args.output} ({time.time() - begin:.0f}s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""
+깊이 제한 탐색용 정적 평가 함수
+
+QuartoState.lines (라인별 공통 특성 코드, 말을 놓을 때마다 AND 한 번으로 갱신) 로부터
+- 공통 특성이 있는 2칸 / 3칸 라인 수
+- 상대에게 주면 바로 지는 말 (3칸 라인의 공통 특성을 가진 말)
+- 안전한 말 수의 홀짝
+을 구해 플레이아웃 없이 리프의 값을 추정한다.
+
+안전한 말이 s 개 남았을 때 두 플레이어가 번갈아 안전한 말을 주면, s 가 홀수이면
+상대가 먼저 안전한 말이 없는 상태를 맞는다. 라인이 많이 찰수록 이 홀짝이 결과에
+가까워지므로 3칸/2칸 라인 수로 가중한다.
+"""
+from quarto_state import line_tactics
+
+
+class HeuristicEvaluator:
+    """
+    MCTS 리프 평가 함수: 플레이아웃 대신 라인 상태로 계산한 값 (mcts 의 evaluate 로 사용)
+    """
+    def __init__(self, parity_weight=0.35, triple_weight=1.0, double_weight=0.25):
+        self.parity_weight = parity_weight  # 홀짝 항의 최대 크기 (0.5 이하)
+        self.triple_weight = triple_weight
+        self.double_weight = double_weight
+
+    def __call__(self, state, player):
+        if state.is_terminal():
+            return state.get_reward(player)
+        value = self.value(state)
+        return value if state.player == player else 1 - value
+
+    def value(self, state):
+        """
+        행동할 플레이어 관점의 값 (승리 1, 패배 0)
+        """
+        board = state.board
+        unsafe, _, triples, doubles = line_tactics(board.occupied, board.lines, count_lines=True)
+        available = board.available
+        if state.selected >= 0:
+            if (unsafe >> state.selected) & 1:
+                return 1.0  # 받은 말로 바로 이김
+            available &= ~(1 << state.selected)
+        safe = bin(available & ~unsafe).count('1')
+        if safe == 0:
+            # 줄 말이 모두 상대를 이기게 함 (놓는 단계면 빈칸을 막아 피할 수도 있음)
+            return 0.0 if state.selected < 0 else 0.5 - self.parity_weight
+        pressure = min(1.0, (self.triple_weight * triples + self.double_weight * doubles) / safe)
+        sign = 1 if safe % 2 else -1
+        return 0.5 + sign * self.parity_weight * pressure
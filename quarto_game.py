@@ -0,0 +1,48 @@
+"""
+심판용 게임 상태 (pygame 없음)
+
+main.py / main_mcts.py 의 화면 심판과 headless.py 의 심판이 같은 규칙으로 판정하도록
+보드 배열(main.py 형식), 비트보드 QuartoState, 남은 말 목록을 함께 유지한다.
+에이전트는 board / available_pieces 객체를 그대로 받아 읽는다.
+"""
+import numpy as np
+
+from quarto_state import BOARD_COLS, BOARD_ROWS, PIECES, QuartoState, cell_index, piece_index
+
+
+class QuartoGame:
+    """
+    한 게임의 보드/말 상태와 승리 판정
+    """
+    def __init__(self):
+        self.board = np.zeros((BOARD_ROWS, BOARD_COLS), dtype=int)
+        self.state = QuartoState()  # board 와 같은 내용을 비트보드로 유지
+        self.available_pieces = PIECES[:]
+
+    def available_square(self, row, col):
+        return 0 <= row < BOARD_ROWS and 0 <= col < BOARD_COLS and not (self.state.occupied >> cell_index(row, col)) & 1
+
+    def is_board_full(self):
+        return self.state.is_full()
+
+    def check_win(self, row=None, col=None):
+        # 미리 계산한 라인 마스크로 가로/세로/대각선/2x2 를 확인
+        if row is None:
+            return self.state.has_win()
+        # 마지막으로 놓은 말을 지나는 라인만 바뀔 수 있다
+        return self.state.wins_at(cell_index(row, col))
+
+    def place(self, row, col, piece):
+        self.board[row][col] = PIECES.index(piece) + 1
+        self.state = self.state.place(cell_index(row, col), piece_index(piece))
+        self.available_pieces.remove(piece)
+
+    def outcome(self, row, col, turn):
+        """
+        turn 플레이어가 (row, col) 에 놓은 뒤의 (게임 종료 여부, 승자 (무승부/진행 중이면 None))
+        """
+        if self.check_win(row, col):
+            return True, turn
+        if self.is_board_full():
+            return True, None
+        return False, None
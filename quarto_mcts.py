@@ -0,0 +1,774 @@
+import json
+import random
+import math
+import sys
+import time
+from itertools import count
+
+from quarto_state import (
+    FULL_MASK, LINE_UPDATES, NUM_CELLS, PIECE_CELL_BITS, ZOBRIST_PLAYER, ZOBRIST_SELECTED, iter_bits, line_tactics,
+    wins_at,
+)
+from quarto_symmetry import canonical_actions
+
+DRAW_REWARD = 0.5
+TIME_SAFETY = 0.9  # 시간 초과를 막기 위해 남겨두는 비율
+
+
+class GameState:
+    """
+    말 선택과 말 배치를 번갈아 진행하는 게임 상태
+
+    selected 가 -1 이면 player 가 상대에게 줄 말을 고르는 단계,
+    아니면 player 가 selected 말을 놓는 단계이다.
+    """
+    __slots__ = ('board', 'selected', 'player', 'winner')
+
+    def __init__(self, board, selected=-1, player=0, winner=-1):
+        self.board = board  # QuartoState
+        self.selected = selected  # 놓아야 할 말의 piece_id (-1: 선택 단계)
+        self.player = player  # 현재 행동할 플레이어 (0 또는 1)
+        self.winner = winner  # 승리한 플레이어 (-1: 없음)
+
+    def get_possible_actions(self):
+        return list(iter_bits(self.action_mask()))
+
+    def action_mask(self):
+        # 선택 단계: 줄 수 있는 말 / 배치 단계: 빈칸 (비트마스크)
+        if self.is_terminal():
+            return 0
+        if self.selected < 0:
+            # 상대가 바로 이길 수 있는 말은 안전한 말이 있으면 제외
+            return self.board.safe_pieces() or self.board.available
+        return self.board.empty_mask()
+
+    def perform_action(self, action):
+        if self.selected < 0:
+            # 말을 건네면 상대가 그 말을 놓는다
+            return GameState(self.board, action, 1 - self.player, -1)
+        board = self.board.place(action, self.selected)
+        winner = self.player if board.wins_at(action) else -1
+        # 말을 놓은 플레이어가 이어서 상대에게 줄 말을 고른다
+        return GameState(board, -1, self.player, winner)
+
+    def clone(self):
+        return GameState(self.board, self.selected, self.player, self.winner)
+
+    def hash_key(self):
+        """
+        보드, 손에 든 말, 행동할 플레이어를 합친 Zobrist 해시
+        """
+        key = self.board.zobrist ^ ZOBRIST_SELECTED[self.selected + 1]
+        return key ^ ZOBRIST_PLAYER if self.player else key
+
+    def is_terminal(self):
+        return self.winner >= 0 or self.board.is_full()
+
+    def get_reward(self, player):
+        """
+        종료 상태에서 player 관점의 보상 (승리 1, 무승부 0.5, 패배 0)
+        """
+        if self.winner < 0:
+            return DRAW_REWARD
+        return 1.0 if self.winner == player else 0.0
+
+
+class Node:
+    """
+    MCTS 알고리즘에서 사용되는 트리 노드
+
+    메모리를 줄이기 위해 상태는 저장하지 않고 (탐색 중 루트 상태에서 행동을 다시
+    적용해 만든다), 아직 확장하지 않은 행동도 비트마스크로 저장한다.
+    """
+    __slots__ = ('parent', 'action', 'player', 'children', 'untried', 'visits', 'value', 'amaf')
+
+    def __init__(self, state, parent=None, action=None, player=-1):
+        self.parent = parent  # 부모 노드
+        self.action = action  # 부모에서 이 노드로 온 행동
+        self.player = player  # 이 노드로 오는 행동을 한 플레이어 (value 는 이 플레이어 관점)
+        self.children = None  # 행동 -> 자식 노드 (첫 확장 때 생성)
+        self.untried = state.action_mask()  # 아직 확장하지 않은 행동 비트마스크
+        self.visits = 0  # 방문 횟수
+        self.value = 0.0  # 가치 합계
+        # RAVE 를 쓸 때만 생성: 자식 행동 a 의 AMAF 방문 수 amaf[a], 가치 합계 amaf[16 + a]
+        # (이 노드에서 행동하는 플레이어 관점, 키는 칸 또는 말 하나뿐인 근사 - update_amaf 참고)
+        self.amaf = None
+
+    def uct_value(self, exploration_weight=1.4, log_parent_visits=None):
+        """
+        UCT (Upper Confidence Bound for Trees) 값 계산
+        """
+        if self.visits == 0:
+            return float('inf')  # 아직 방문하지 않은 노드는 높은 탐색 우선순위를 부여
+        if log_parent_visits is None:
+            log_parent_visits = math.log(self.parent.visits)
+        exploitation = self.value / self.visits
+        exploration = exploration_weight * math.sqrt(log_parent_visits / self.visits)
+        return exploitation + exploration
+
+    def is_fully_expanded(self):
+        """
+        현재 노드가 모든 가능한 자식을 생성했는지 확인
+        """
+        return not self.untried
+
+    def pop_untried_action(self):
+        """
+        확장하지 않은 행동 중 하나를 무작위로 꺼냄
+        """
+        untried = self.untried
+        k = random.randrange(bin(untried).count('1'))
+        for action in iter_bits(untried):
+            if not k:
+                self.untried = untried & ~(1 << action)
+                return action
+            k -= 1
+
+    def select_child(self, exploration_weight=1.4):
+        """
+        UCT 값이 가장 큰 (행동, 자식 노드) 반환
+        """
+        log_visits = math.log(self.visits)
+        return max(
+            self.children.items(),
+            key=lambda item: item[1].uct_value(exploration_weight, log_visits),
+        )
+
+    def select_child_rave(self, exploration_weight=1.4, rave=300):
+        """
+        자식 가치와 AMAF 가치를 beta = sqrt(rave / (3n + rave)) 로 섞은 값에
+        UCT 탐색 항을 더해 가장 큰 (행동, 자식 노드) 반환
+        """
+        amaf = self.amaf
+        if amaf is None:
+            return self.select_child(exploration_weight)
+        log_visits = math.log(self.visits)
+        best_score = -1.0
+        best = None
+        for item in self.children.items():
+            action, child = item
+            if child.visits == 0:
+                return item
+            value = child.value / child.visits
+            amaf_visits = amaf[action]
+            if amaf_visits:
+                beta = math.sqrt(rave / (3 * child.visits + rave))
+                value = (1 - beta) * value + beta * amaf[NUM_CELLS + action] / amaf_visits
+            score = value + exploration_weight * math.sqrt(log_visits / child.visits)
+            if score > best_score:
+                best_score = score
+                best = item
+        return best
+
+    def pop_rave_action(self):
+        """
+        확장하지 않은 행동 중 AMAF 가치가 가장 높은 것을 꺼냄 (AMAF 기록이 없는 행동 우선)
+        """
+        amaf = self.amaf
+        if amaf is None:
+            return self.pop_untried_action()
+        best_score = -1.0
+        best = -1
+        for action in iter_bits(self.untried):
+            visits = amaf[action]
+            score = amaf[NUM_CELLS + action] / visits if visits else 2.0
+            if score > best_score:
+                best_score = score
+                best = action
+        self.untried &= ~(1 << best)
+        return best
+
+    def best_child(self):
+        """
+        방문 횟수를 기준으로 가장 좋은 자식 노드 반환
+        """
+        return max(self.children.values(), key=lambda child: child.visits)
+
+
+class PUCTNode:
+    """
+    PUCT 탐색 노드
+
+    처음 방문할 때 모델의 사전 확률과 함께 모든 자식을 한 번에 만든다.
+    Node 와 같이 상태는 저장하지 않고 value 는 이 노드로 오는 행동을 한 플레이어 관점이다.
+    """
+    __slots__ = ('player', 'prior', 'children', 'visits', 'value')
+
+    def __init__(self, player=-1, prior=1.0):
+        self.player = player  # 이 노드로 오는 행동을 한 플레이어
+        self.prior = prior  # 부모에서 이 행동을 고를 사전 확률
+        self.children = None  # 행동 -> 자식 노드 (None: 아직 평가하지 않은 리프)
+        self.visits = 0
+        self.value = 0.0
+
+    def select_child(self, c_puct=1.5):
+        """
+        Q + c_puct * P * sqrt(N) / (1 + n) 가 가장 큰 (행동, 자식 노드) 반환
+        """
+        sqrt_visits = math.sqrt(self.visits)
+        best_score = -1.0
+        best = None
+        for item in self.children.items():
+            child = item[1]
+            q = child.value / child.visits if child.visits else DRAW_REWARD
+            score = q + c_puct * child.prior * sqrt_visits / (1 + child.visits)
+            if score > best_score:
+                best_score = score
+                best = item
+        return best
+
+
+class TranspositionTable:
+    """
+    Zobrist 해시로 같은 상태의 노드를 공유하는 크기 제한 테이블
+
+    다른 수순으로 같은 상태에 도달하면 같은 노드를 자식으로 연결하므로
+    방문 횟수와 가치가 합쳐진다. 가득 차면 방문 횟수가 적은 절반을 버린다
+    (버려진 노드도 이미 연결된 트리에서는 계속 사용된다).
+
+    키는 대칭 정규화(canonical_hash)하지 않은 원래 Zobrist 해시다. 정규 키는 하나에
+    약 0.5ms 로 반복 한 번(약 65us)보다 훨씬 비싸고, 대칭인 상태끼리 노드를 공유하려면
+    자식의 행동을 변환을 거쳐 옮겨야 한다. 대칭은 루트에서만(root_symmetry) 이용한다.
+    """
+    def __init__(self, max_size=200000):
+        self.max_size = max_size
+        self.nodes = {}  # 해시 -> 노드
+        self.hits = 0  # 기존 노드를 재사용한 횟수
+
+    def get(self, key):
+        node = self.nodes.get(key)
+        if node is not None:
+            self.hits += 1
+        return node
+
+    def put(self, key, node):
+        if len(self.nodes) >= self.max_size:
+            self._evict()
+        self.nodes[key] = node
+
+    def _evict(self):
+        # 방문 횟수가 많은 절반만 남김
+        kept = sorted(self.nodes.items(), key=lambda item: item[1].visits, reverse=True)
+        self.nodes = dict(kept[:self.max_size // 2])
+
+    def __len__(self):
+        return len(self.nodes)
+
+
+def move_time_limit(num_empty, remaining_time=None, time_per_move=None):
+    """
+    이번 수에 쓸 탐색 시간(초) 계산
+
+    남은 게임 시간은 앞으로 내가 둘 선택/배치 횟수(대략 빈칸 수)로 나누어 쓰고,
+    time_per_move 가 있으면 그 값을 넘지 않는다. 둘 다 없으면 None (시간 제한 없음)
+    """
+    limits = []
+    if remaining_time is not None:
+        limits.append(max(0.0, remaining_time) * TIME_SAFETY / max(1, num_empty))
+    if time_per_move is not None:
+        limits.append(time_per_move * TIME_SAFETY)
+    return min(limits) if limits else None
+
+
+class SearchStats:
+    """
+    mcts() 계측 결과 (mcts 에 stats 로 넘길 때만 수집)
+    """
+    def __init__(self):
+        self.iterations = 0
+        self.nodes_created = 0
+        self.transposition_hits = 0  # 확장 때 트랜스포지션 테이블의 노드를 재사용한 횟수
+        self.depth_sum = 0  # 반복마다 리프 깊이 합
+        self.max_depth = 0
+        self.rollouts = 0  # simulate 호출 수
+        self.rollout_plies = 0  # 플레이아웃에서 놓은 말 수 합
+        self.time_selection = 0.0
+        self.time_expansion = 0.0
+        self.time_simulation = 0.0
+        self.time_backprop = 0.0
+        self.root_children = {}  # 행동 -> (방문 횟수, 평균 가치)
+
+    @property
+    def average_depth(self):
+        return self.depth_sum / self.iterations if self.iterations else 0.0
+
+    @property
+    def average_rollout_length(self):
+        return self.rollout_plies / self.rollouts if self.rollouts else 0.0
+
+    @property
+    def total_time(self):
+        return self.time_selection + self.time_expansion + self.time_simulation + self.time_backprop
+
+    def to_dict(self):
+        total = self.total_time or 1.0
+        return {
+            'iterations': self.iterations,
+            'nodes_created': self.nodes_created,
+            'transposition_hits': self.transposition_hits,
+            'average_depth': self.average_depth,
+            'max_depth': self.max_depth,
+            'rollouts': self.rollouts,
+            'average_rollout_length': self.average_rollout_length,
+            'time': {
+                'selection': self.time_selection,
+                'expansion': self.time_expansion,
+                'simulation': self.time_simulation,
+                'backprop': self.time_backprop,
+                'total': self.total_time,
+            },
+            'time_share': {
+                'selection': self.time_selection / total,
+                'expansion': self.time_expansion / total,
+                'simulation': self.time_simulation / total,
+                'backprop': self.time_backprop / total,
+            },
+            'root_children': {str(action): {'visits': visits, 'value': value}
+                              for action, (visits, value) in self.root_children.items()},
+        }
+
+    def dump_json(self, path, **extra):
+        """
+        path 에 한 줄짜리 JSON 으로 덧붙여 저장 (extra 는 함께 기록할 값)
+        """
+        with open(path, 'a') as f:
+            f.write(json.dumps(dict(extra, **self.to_dict())) + '\n')
+
+
+def tree_memory_usage(root):
+    """
+    root 아래 트리의 노드 수와 메모리 사용량 (노드 객체 + 자식 dict, 바이트)
+    """
+    seen = set()
+    stack = [root]
+    total = 0
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        total += sys.getsizeof(node) + sys.getsizeof(node.value)
+        if node.amaf is not None:
+            total += sys.getsizeof(node.amaf)
+        if node.children is not None:
+            total += sys.getsizeof(node.children)
+            stack.extend(node.children.values())
+    return {'nodes': len(seen), 'bytes': total, 'bytes_per_node': total / max(1, len(seen))}
+
+
+def reuse_subtree(node, node_state, state, max_plies=3):
+    """
+    이전 탐색 트리의 node (상태 node_state) 아래에서 state 와 같은 상태의 자식 노드를 찾음
+
+    내 배치 -> 내 선택은 1수, 내 선택 -> 상대 배치 -> 상대 선택은 3수이므로
+    max_plies 수 안에서 실제로 둔 행동을 따라 내려간다. 찾은 노드는 새 루트로 쓰도록
+    부모와 연결을 끊고, 없으면 None 을 반환한다.
+    """
+    target = state.board
+    for _ in range(max_plies + 1):
+        if node_state.board == target and node_state.selected == state.selected:
+            node.parent = None
+            return node
+        if node_state.is_terminal() or node.children is None:
+            return None
+        board = node_state.board
+        placed = target.occupied & ~board.occupied
+        if node_state.selected >= 0:
+            # 배치 단계: 새로 채워진 칸
+            if placed & (placed - 1) or not placed:
+                return None
+            action = placed.bit_length() - 1
+        elif placed:
+            # 선택 단계: 그 다음 놓인 말
+            action = target.piece_at(placed.bit_length() - 1)
+        else:
+            # 선택 단계: 아직 놓이지 않았으면 지금 받은 말
+            action = state.selected
+        node = node.children.get(action)
+        if node is None:
+            return None
+        node_state = node_state.perform_action(action)
+    return None
+
+
+def check_playable(state):
+    """
+    이미 끝난 상태에서 탐색하려 하면 ValueError
+    """
+    if state.is_terminal():
+        raise ValueError("이미 끝난 게임 상태에서는 둘 수 있는 행동이 없습니다")
+
+
+def most_visited_action(state, visits):
+    """
+    visits (행동 -> 방문 횟수) 에서 가장 많이 방문한 행동 반환
+    첫 확장 전에 시간이 다 되어 통계가 없으면 둘 수 있는 행동 중 무작위로 고른다.
+    """
+    if not visits:
+        return random.choice(state.get_possible_actions())
+    return max(visits.items(), key=lambda item: item[1])[0]
+
+
+def mcts(initial_state, simulation_count=10000, max_depth=7, exploration_weight=1.4,
+         time_limit=None, check_interval=64, root=None, transposition_table=None,
+         root_symmetry=False, evaluate=None, stats=None, rave=0):
+    """
+    MCTS 로 initial_state 에서 둘 행동을 결정
+    각 노드의 가치는 그 노드로 오는 행동을 한 플레이어 관점으로 쌓는다 (negamax)
+
+    time_limit(초) 를 주면 check_interval 번마다 시간을 확인하고, 시간이 지나면
+    그때까지 찾은 가장 좋은 행동을 반환한다. simulation_count 가 None 이면
+    시간 제한까지 반복한다.
+
+    root 로 이전 탐색의 노드(reuse_subtree 결과)를 주면 그 통계를 이어서 사용한다.
+    transposition_table 을 주면 같은 상태의 노드를 공유하므로 트리가 DAG 가 되고,
+    역전파는 이번 반복에서 지나온 경로를 따라 진행한다.
+    root_symmetry 가 True 이면 루트에서 대칭으로 같은 행동은 하나만 탐색한다.
+    evaluate(state, player) 로 리프 평가 방법을 바꿀 수 있다 (기본: simulate 플레이아웃 1회).
+    stats 로 SearchStats 를 주면 단계별 시간, 노드 수, 깊이 등을 채운다 (없으면 계측하지 않음).
+    rave 가 0 보다 크면 트리와 플레이아웃에서 나중에 둔 행동의 AMAF 통계를 노드에 쌓고,
+    방문이 적은 자식은 그 값을 섞어 평가한다 (rave 는 두 값의 비중이 같아지는 방문 수 근처).
+    AMAF 는 놓을 말 / 남은 보드와 무관하게 칸 또는 말만으로 묶는 근사라서 기본값은 꺼 둔다.
+    """
+    if simulation_count is None and time_limit is None:
+        raise ValueError("simulation_count 또는 time_limit 중 하나는 필요합니다")
+    check_playable(initial_state)
+    deadline = time.perf_counter() + time_limit if time_limit is not None else None
+
+    if root is None:
+        root = Node(initial_state)
+    if root_symmetry and not root.children:
+        root.untried = sum(1 << action for action in canonical_actions(initial_state))
+    player = initial_state.player
+    if evaluate is None:
+        evaluate = simulate
+    rollout = evaluate in ROLLOUT_POLICIES.values()
+    trace = None
+
+    iterations = count() if simulation_count is None else range(simulation_count)
+    for i in iterations:
+        if deadline is not None and i and i % check_interval == 0 and time.perf_counter() >= deadline:
+            break
+
+        if stats is not None:
+            started = time.perf_counter()
+
+        # 1: 선택 - 모두 확장된 노드는 UCT 로 내려감
+        node = root
+        state = initial_state
+        path = [root]
+        depth = 0
+        if rave:
+            trace = []  # 이번 반복에서 둔 행동 (move_code)
+        while node.children and not node.untried and depth < max_depth:
+            if rave:
+                action, node = node.select_child_rave(exploration_weight, rave)
+                trace.append(move_code(state, action))
+            else:
+                action, node = node.select_child(exploration_weight)
+            state = state.perform_action(action)
+            path.append(node)
+            depth += 1
+
+        if stats is not None:
+            selected_at = time.perf_counter()
+            stats.time_selection += selected_at - started
+
+        # 2: 확장
+        if node.untried and depth < max_depth:
+            if rave:
+                action = node.pop_rave_action()
+                trace.append(move_code(state, action))
+                node, state = expand(node, state, transposition_table, stats, action)
+            else:
+                node, state = expand(node, state, transposition_table, stats)
+            path.append(node)
+
+        if stats is not None:
+            expanded_at = time.perf_counter()
+            stats.time_expansion += expanded_at - selected_at
+
+        # 3: 시뮬레이션 (루트 플레이어 관점 보상)
+        if rollout:
+            value = evaluate(state, player, stats, trace)
+        else:
+            value = evaluate(state, player)
+
+        if stats is not None:
+            simulated_at = time.perf_counter()
+            stats.time_simulation += simulated_at - expanded_at
+
+        # 4: 역전파 - 행동한 플레이어에 따라 보상을 뒤집음
+        for node in path:
+            node.visits += 1
+            node.value += value if node.player == player else 1 - value
+        if trace is not None:
+            update_amaf(path, trace, value, player)
+
+        if stats is not None:
+            stats.time_backprop += time.perf_counter() - simulated_at
+            stats.iterations += 1
+            stats.depth_sum += len(path) - 1
+            stats.max_depth = max(stats.max_depth, len(path) - 1)
+
+    if stats is not None:
+        stats.root_children = {
+            action: (child.visits, child.value / child.visits if child.visits else 0.0)
+            for action, child in (root.children or {}).items()
+        }
+
+    # 최적의 행동 반환 (공유된 노드의 action 은 다른 부모 기준일 수 있으므로 키 사용)
+    return most_visited_action(initial_state,
+                               {action: child.visits for action, child in (root.children or {}).items()})
+
+
+def mcts_with_stats(initial_state, **kwargs):
+    """
+    mcts() 를 계측하며 실행하고 (행동, SearchStats) 반환
+    """
+    stats = SearchStats()
+    action = mcts(initial_state, stats=stats, **kwargs)
+    return action, stats
+
+
+def puct_mcts(initial_state, model, simulation_count=800, c_puct=1.5, time_limit=None, check_interval=64,
+              root=None, root_symmetry=False, batch_size=1):
+    """
+    모델의 정책을 사전 확률로, 가치를 리프 값으로 쓰는 PUCT 탐색으로 둘 행동 결정
+
+    model.predict(states) 는 (행동 16개의 사전 확률 배열, 행동할 플레이어 관점 가치 -1~1 배열) 을
+    반환해야 한다. 리프를 batch_size 개까지 모아 모델을 한 번에 호출하고, 모으는 동안은
+    지나간 노드에 가상 손실(보상 0 인 방문)을 걸어 다음 선택이 다른 가지로 가게 한다.
+    """
+    if simulation_count is None and time_limit is None:
+        raise ValueError("simulation_count 또는 time_limit 중 하나는 필요합니다")
+    check_playable(initial_state)
+    deadline = time.perf_counter() + time_limit if time_limit is not None else None
+
+    if root is None:
+        root = PUCTNode()
+    player = initial_state.player
+
+    done = 0
+    next_check = check_interval
+    while simulation_count is None or done < simulation_count:
+        if deadline is not None and done >= next_check:
+            next_check += check_interval
+            if time.perf_counter() >= deadline:
+                break
+
+        # 1: 선택 - 방문 수는 내려가면서 바로 더하고 (가상 손실), 보상은 평가 후에 더함
+        leaves = []  # 평가할 (리프 노드, 상태)
+        leaf_index = {}  # id(리프 노드) -> leaves 인덱스 (같은 리프는 한 번만 평가)
+        pending = []  # (경로, leaves 인덱스)
+        size = batch_size if simulation_count is None else min(batch_size, simulation_count - done)
+        for _ in range(size):
+            node = root
+            state = initial_state
+            path = [root]
+            root.visits += 1
+            while node.children:
+                action, node = node.select_child(c_puct)
+                state = state.perform_action(action)
+                node.visits += 1
+                path.append(node)
+
+            if state.is_terminal():
+                value = state.get_reward(player)
+                for node in path:
+                    node.value += value if node.player == player else 1 - value
+                continue
+            index = leaf_index.get(id(node))
+            if index is None:
+                index = leaf_index[id(node)] = len(leaves)
+                leaves.append((node, state))
+            pending.append((path, index))
+        done += size
+
+        if not leaves:
+            continue
+
+        # 2: 평가와 확장 (루트 플레이어 관점 보상)
+        priors, values = model.predict([state for _, state in leaves])
+        leaf_values = []
+        for i, (node, state) in enumerate(leaves):
+            if node is root and root_symmetry:
+                actions = canonical_actions(state)
+            else:
+                actions = state.get_possible_actions()
+            expand_puct(node, state, priors[i], actions)
+            value = (1 + float(values[i])) / 2
+            leaf_values.append(value if state.player == player else 1 - value)
+
+        # 3: 역전파
+        for path, index in pending:
+            value = leaf_values[index]
+            for node in path:
+                node.value += value if node.player == player else 1 - value
+
+    return most_visited_action(initial_state,
+                               {action: child.visits for action, child in (root.children or {}).items()})
+
+
+def expand_puct(node, state, priors, actions):
+    """
+    node 에 actions 의 자식을 만들고 사전 확률을 actions 안에서 다시 정규화
+    """
+    total = sum(float(priors[action]) for action in actions)
+    uniform = 1.0 / len(actions)
+    node.children = {
+        action: PUCTNode(state.player, float(priors[action]) / total if total > 0 else uniform)
+        for action in actions
+    }
+
+
+def move_code(state, action):
+    """
+    AMAF 용 행동 코드: 행동한 플레이어 << 5 | 종류 (0: 말 선택, 1: 배치) << 4 | 행동
+    """
+    return (state.player << 5) | (16 if state.selected >= 0 else 0) | action
+
+
+def update_amaf(path, trace, value, player):
+    """
+    path[i] 에서 행동한 플레이어가 i 번째 이후에 둔 같은 종류의 행동마다
+    path[i] 의 AMAF 통계에 그 플레이어 관점 보상을 더함
+
+    놓기는 칸만, 말 주기는 말만 키로 쓰는 근사다. 나중에 같은 칸에 놓인 말은 지금 들고 있는
+    말과 다르고 (말은 한 번만 놓이므로 (칸, 말) 로 묶으면 일치하는 기록이 생기지 않는다),
+    나중에 준 말도 다른 보드에서 건넨 것이다. 그래서 AMAF 값은 편향되어 있고, 기본 설정에서는
+    쓰지 않는다.
+    """
+    later = [0, 0, 0, 0]  # (플레이어, 종류) 별 이후에 둔 행동 마스크
+    for i in range(len(trace) - 1, -1, -1):
+        code = trace[i]
+        key = code >> 4
+        later[key] |= 1 << (code & 15)
+        if i >= len(path):
+            continue  # 플레이아웃 안의 행동
+        node = path[i]
+        amaf = node.amaf
+        if amaf is None:
+            amaf = node.amaf = [0.0] * (2 * NUM_CELLS)
+        reward = value if key >> 1 == player else 1 - value
+        for action in iter_bits(later[key]):
+            amaf[action] += 1
+            amaf[NUM_CELLS + action] += reward
+
+
+def expand(node, state, transposition_table=None, stats=None, action=None):
+    """
+    현재 노드(상태 state)에서 새로운 자식 노드를 확장하고 (자식 노드, 자식 상태) 반환
+    transposition_table 에 같은 상태의 노드가 있으면 그 노드를 자식으로 연결
+    action 을 주지 않으면 확장하지 않은 행동 중 무작위로 고른다.
+    """
+    if action is None:
+        action = node.pop_untried_action()
+    new_state = state.perform_action(action)
+    child_node = None
+    if transposition_table is not None:
+        key = new_state.hash_key()
+        child_node = transposition_table.get(key)
+        if child_node is None:
+            child_node = Node(new_state, parent=node, action=action, player=state.player)
+            transposition_table.put(key, child_node)
+            if stats is not None:
+                stats.nodes_created += 1
+        elif stats is not None:
+            stats.transposition_hits += 1
+    else:
+        child_node = Node(new_state, parent=node, action=action, player=state.player)
+        if stats is not None:
+            stats.nodes_created += 1
+    if node.children is None:
+        node.children = {}
+    node.children[action] = child_node
+    return child_node, new_state
+
+
+def simulate(state, player, stats=None, trace=None):
+    """
+    state 에서 말 선택/배치를 무작위로 번갈아 두어 게임 끝까지 진행하고
+    player 관점의 보상을 반환 (stats 를 주면 플레이아웃 길이를, trace 를 주면 둔 행동의
+    move_code 를 기록)
+    """
+    if stats is not None:
+        stats.rollouts += 1
+    if state.is_terminal():
+        return state.get_reward(player)
+
+    # 객체를 만들지 않도록 정수 비트마스크만으로 진행
+    board = state.board
+    occupied, attrs, available = board.occupied, board.attrs, board.available
+    selected = state.selected
+    turn = state.player
+    while True:
+        if selected < 0:
+            # 말 선택 후 상대 차례
+            selected = random.choice(list(iter_bits(available)))
+            if trace is not None:
+                trace.append((turn << 5) | selected)
+            turn = 1 - turn
+        cell = random.choice(list(iter_bits(FULL_MASK & ~occupied)))
+        if trace is not None:
+            trace.append((turn << 5) | 16 | cell)
+        occupied |= 1 << cell
+        attrs |= PIECE_CELL_BITS[selected][cell]
+        available &= ~(1 << selected)
+        selected = -1
+        if stats is not None:
+            stats.rollout_plies += 1
+        if wins_at(occupied, attrs, cell):
+            return 1.0 if turn == player else 0.0
+        if occupied == FULL_MASK:
+            return DRAW_REWARD
+
+
+def tactical_simulate(state, player, stats=None, trace=None):
+    """
+    simulate 와 같지만 받은 말로 바로 이길 수 있으면 이기고, 안전한 말이 있으면
+    상대가 바로 이길 수 있는 말은 주지 않는 플레이아웃
+    """
+    if stats is not None:
+        stats.rollouts += 1
+    if state.is_terminal():
+        return state.get_reward(player)
+
+    board = state.board
+    occupied, lines, available = board.occupied, board.lines, board.available
+    selected = state.selected
+    turn = state.player
+    if selected >= 0:
+        wins = line_tactics(occupied, lines, selected)[1]
+        if wins:
+            if trace is not None:
+                trace.append((turn << 5) | 16 | ((wins & -wins).bit_length() - 1))
+            return 1.0 if turn == player else 0.0
+    while True:
+        if selected < 0:
+            # 안전한 말을 주면 받은 쪽은 바로 이길 수 없으므로 무작위로 놓음
+            safe = available & ~line_tactics(occupied, lines)[0]
+            turn = 1 - turn
+            if not safe:
+                return 1.0 if turn == player else 0.0  # 어떤 말을 줘도 상대가 바로 이김
+            selected = random.choice(list(iter_bits(safe)))
+            if trace is not None:
+                trace.append(((1 - turn) << 5) | selected)
+        cell = random.choice(list(iter_bits(FULL_MASK & ~occupied)))
+        if trace is not None:
+            trace.append((turn << 5) | 16 | cell)
+        occupied |= 1 << cell
+        lines &= LINE_UPDATES[selected][cell]
+        available &= ~(1 << selected)
+        selected = -1
+        if stats is not None:
+            stats.rollout_plies += 1
+        if occupied == FULL_MASK:
+            return DRAW_REWARD
+
+
+# 에이전트에서 이름으로 고르는 플레이아웃 정책
+ROLLOUT_POLICIES = {
+    'random': simulate,
+    'tactical': tactical_simulate,
+}
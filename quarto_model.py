@@ -0,0 +1,248 @@
+"""
+PUCT 탐색용 정책/가치 모델 (NumPy, CPU)
+
+입력은 직접 만든 특징 (칸별 말 특성, 손에 든 말, 남은 말, 바로 지는 말, 바로 이기는 칸,
+라인 수와 안전한 말 수의 홀짝) 이고, 은닉층 하나인 작은 MLP 가 행동 16개의 정책과
+행동할 플레이어 관점 가치(-1~1)를 낸다. 추론과 학습 모두 여러 상태를 한 번에 계산한다.
+
+학습: python quarto_model.py data/ --output model.npz --epochs 20
+      (data/ 는 selfplay.py 로 만든 샤드 디렉터리)
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from quarto_batch import LINE_CELLS
+from quarto_state import NUM_ATTRS, NUM_CELLS, NUM_PIECES, PIECE_CODES
+from selfplay import load_records
+
+_CODES = np.array(PIECE_CODES, dtype=np.uint8)
+_PIECE_BITS = np.array(
+    [[1.0 if (piece_id >> (NUM_ATTRS - 1 - a)) & 1 else -1.0 for a in range(NUM_ATTRS)]
+     for piece_id in range(NUM_PIECES)],
+    dtype=np.float32,
+)
+# 보드 값 (0: 빈칸, 1~16: 말 + 1) -> (놓였는지, 특성 ±1 x 4)
+_CELL_FEATURES = np.vstack([np.zeros((1, 1 + NUM_ATTRS), dtype=np.float32),
+                            np.hstack([np.ones((NUM_PIECES, 1), dtype=np.float32), _PIECE_BITS])])
+_BITS = 1 << np.arange(NUM_PIECES)
+
+NUM_FEATURES = NUM_CELLS * (1 + NUM_ATTRS) + (1 + NUM_ATTRS) + 3 * NUM_PIECES + 5
+
+
+def states_to_arrays(states):
+    """
+    GameState 목록 -> (보드 (n, 16), 남은 말 마스크 (n,), 손에 든 말 (n,))
+    """
+    boards = np.array([[state.board.piece_at(cell) + 1 for cell in range(NUM_CELLS)] for state in states],
+                      dtype=np.int64)
+    available = np.array([state.board.available for state in states], dtype=np.int64)
+    selected = np.array([state.selected for state in states], dtype=np.int64)
+    return boards, available, selected
+
+
+def encode_arrays(boards, available, selected):
+    """
+    (특징 (n, NUM_FEATURES), 둘 수 있는 행동 마스크 (n, 16)) 반환
+
+    행동 마스크는 GameState.action_mask 와 같다 (선택 단계는 안전한 말이 있으면 안전한 말만).
+    """
+    boards = np.asarray(boards, dtype=np.int64)
+    selected = np.asarray(selected, dtype=np.int64)
+    n = len(boards)
+    placing = selected >= 0
+    available = (np.asarray(available, dtype=np.int64)[:, None] & _BITS) != 0
+    available &= ~(placing[:, None] & (np.arange(NUM_PIECES) == selected[:, None]))  # 손에 든 말 제외
+
+    # 라인별 공통 특성 코드와 찬 칸 수
+    occupied = boards > 0
+    codes = np.where(occupied, _CODES[np.maximum(boards - 1, 0)], 0xFF).astype(np.uint8)
+    shared = np.bitwise_and.reduce(codes[:, LINE_CELLS], axis=2)  # (n, 19)
+    filled = occupied[:, LINE_CELLS].sum(axis=2)
+    open_triple = (filled == 3) & (shared != 0)
+    doubles = ((filled == 2) & (shared != 0)).sum(axis=1)
+
+    # 바로 지는 말: 3칸 라인의 공통 특성을 가진 말
+    unsafe = (((shared[:, :, None] & _CODES) != 0) & open_triple[:, :, None]).any(axis=1) & available
+    safe = available & ~unsafe
+    num_safe = safe.sum(axis=1)
+
+    # 손에 든 말로 바로 이기는 칸: 3칸 라인 중 공통 특성이 그 말과 맞는 라인의 빈칸
+    selected_codes = _CODES[np.maximum(selected, 0)]
+    winning_lines = open_triple & ((shared & selected_codes[:, None]) != 0) & placing[:, None]
+    line_empty = ~occupied[:, LINE_CELLS]  # (n, 19, 4)
+    winning = np.zeros((n, NUM_CELLS), dtype=bool)
+    rows, lines = np.nonzero(winning_lines)
+    if len(rows):
+        cells = LINE_CELLS[lines, np.argmax(line_empty[rows, lines], axis=1)]
+        winning[rows, cells] = True
+
+    features = np.concatenate([
+        _CELL_FEATURES[boards].reshape(n, -1),
+        placing[:, None].astype(np.float32),
+        np.where(placing[:, None], _PIECE_BITS[np.maximum(selected, 0)], 0.0),
+        available,
+        unsafe,
+        winning,
+        (doubles / 19.0)[:, None],
+        (open_triple.sum(axis=1) / 19.0)[:, None],
+        (num_safe / 16.0)[:, None],
+        np.where(num_safe % 2 == 1, 1.0, -1.0)[:, None],
+        ((~occupied).sum(axis=1) / 16.0)[:, None],
+    ], axis=1).astype(np.float32)
+
+    legal = np.where(placing[:, None], ~occupied, np.where(num_safe[:, None] > 0, safe, available))
+    return features, legal
+
+
+def _masked_softmax(logits, legal):
+    logits = np.where(legal, logits, -1e9)
+    logits = logits - logits.max(axis=1, keepdims=True)
+    exp = np.exp(logits) * legal
+    return exp / np.maximum(exp.sum(axis=1, keepdims=True), 1e-12)
+
+
+class PolicyValueModel:
+    """
+    은닉층 하나 (ReLU) 의 정책/가치 MLP
+    """
+    PARAMS = ('w1', 'b1', 'wp', 'bp', 'wv', 'bv')
+
+    def __init__(self, hidden=64, seed=0):
+        rng = np.random.default_rng(seed)
+        self.w1 = (rng.standard_normal((NUM_FEATURES, hidden)) * np.sqrt(2.0 / NUM_FEATURES)).astype(np.float32)
+        self.b1 = np.zeros(hidden, dtype=np.float32)
+        self.wp = (rng.standard_normal((hidden, NUM_CELLS)) * np.sqrt(1.0 / hidden)).astype(np.float32)
+        self.bp = np.zeros(NUM_CELLS, dtype=np.float32)
+        self.wv = (rng.standard_normal((hidden, 1)) * np.sqrt(1.0 / hidden)).astype(np.float32)
+        self.bv = np.zeros(1, dtype=np.float32)
+
+    def forward(self, features):
+        """
+        (은닉층, 정책 로짓, 가치) 반환
+        """
+        hidden = np.maximum(features @ self.w1 + self.b1, 0.0)
+        return hidden, hidden @ self.wp + self.bp, np.tanh(hidden @ self.wv + self.bv)[:, 0]
+
+    def predict(self, states):
+        """
+        GameState 목록의 (행동별 사전 확률 (n, 16), 행동할 플레이어 관점 가치 (n,))
+        """
+        features, legal = encode_arrays(*states_to_arrays(states))
+        _, logits, values = self.forward(features)
+        return _masked_softmax(logits, legal), values
+
+    def save(self, path):
+        np.savez(path, **{name: getattr(self, name) for name in self.PARAMS})
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        model = cls(hidden=data['b1'].shape[0])
+        for name in cls.PARAMS:
+            setattr(model, name, data[name].astype(np.float32))
+        return model
+
+
+def records_to_training(records):
+    """
+    selfplay 레코드 -> (특징, 행동 마스크, 정책 목표 (방문 비율), 가치 목표 (결과))
+    """
+    features, legal = encode_arrays(records['board'], records['available'], records['selected'])
+    visits = records['visits'].astype(np.float32) * legal
+    totals = visits.sum(axis=1, keepdims=True)
+    # 방문 기록이 없으면 고른 행동을 목표로 사용
+    one_hot = np.eye(NUM_CELLS, dtype=np.float32)[records['action'].astype(np.int64)]
+    policy = np.where(totals > 0, visits / np.maximum(totals, 1.0), one_hot)
+    return features, legal, policy, records['outcome'].astype(np.float32)
+
+
+class Adam:
+    """
+    파라미터별 Adam 최적화
+    """
+    def __init__(self, model, lr=1e-3, beta1=0.9, beta2=0.999, eps=1e-8):
+        self.lr, self.beta1, self.beta2, self.eps = lr, beta1, beta2, eps
+        self.m = {name: np.zeros_like(getattr(model, name)) for name in model.PARAMS}
+        self.v = {name: np.zeros_like(getattr(model, name)) for name in model.PARAMS}
+        self.t = 0
+
+    def step(self, model, grads):
+        self.t += 1
+        for name, grad in grads.items():
+            self.m[name] = self.beta1 * self.m[name] + (1 - self.beta1) * grad
+            self.v[name] = self.beta2 * self.v[name] + (1 - self.beta2) * grad * grad
+            m_hat = self.m[name] / (1 - self.beta1 ** self.t)
+            v_hat = self.v[name] / (1 - self.beta2 ** self.t)
+            setattr(model, name, getattr(model, name) - self.lr * m_hat / (np.sqrt(v_hat) + self.eps))
+
+
+def train_step(model, optimizer, features, legal, policy, value, value_weight=1.0):
+    """
+    교차 엔트로피 (정책) + 제곱 오차 (가치) 로 한 번 갱신하고 (정책 손실, 가치 손실) 반환
+    """
+    n = len(features)
+    hidden, logits, predicted = model.forward(features)
+    probs = _masked_softmax(logits, legal)
+    policy_loss = -float((policy * np.log(np.maximum(probs, 1e-12))).sum() / n)
+    value_loss = float(((predicted - value) ** 2).mean())
+
+    d_logits = (probs - policy) / n
+    d_value = (value_weight * 2.0 * (predicted - value) * (1.0 - predicted ** 2) / n)[:, None]
+    d_hidden = (d_logits @ model.wp.T + d_value @ model.wv.T) * (hidden > 0)
+    grads = {
+        'wp': hidden.T @ d_logits,
+        'bp': d_logits.sum(axis=0),
+        'wv': hidden.T @ d_value,
+        'bv': d_value.sum(axis=0),
+        'w1': features.T @ d_hidden,
+        'b1': d_hidden.sum(axis=0),
+    }
+    optimizer.step(model, grads)
+    return policy_loss, value_loss
+
+
+def train(model, records, epochs=10, batch_size=256, lr=1e-3, seed=0, verbose=False):
+    """
+    selfplay 레코드로 model 을 학습하고 epoch 별 (정책 손실, 가치 손실) 목록 반환
+    """
+    features, legal, policy, value = records_to_training(records)
+    rng = np.random.default_rng(seed)
+    optimizer = Adam(model, lr)
+    history = []
+    for epoch in range(epochs):
+        order = rng.permutation(len(features))
+        losses = []
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            losses.append(train_step(model, optimizer, features[batch], legal[batch], policy[batch], value[batch]))
+        history.append(tuple(np.mean(losses, axis=0)) if losses else (0.0, 0.0))
+        if verbose:
+            print(f"epoch {epoch + 1}: policy {history[-1][0]:.4f}  value {history[-1][1]:.4f}")
+    return history
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the Quarto policy/value model on self-play records")
+    parser.add_argument('directory', help="self-play shard directory")
+    parser.add_argument('--output', default='model.npz')
+    parser.add_argument('--epochs', type=int, default=20)
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--lr', type=float, default=1e-3)
+    parser.add_argument('--hidden', type=int, default=64)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    records = np.asarray(load_records(args.directory))
+    begin = time.time()
+    model = PolicyValueModel(args.hidden, args.seed)
+    train(model, records, args.epochs, args.batch_size, args.lr, args.seed, verbose=True)
+    model.save(args.output)
+    print(f"{len(records)} positions, {time.time() - begin:.0f}s -> {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
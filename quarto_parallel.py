@@ -0,0 +1,367 @@
+"""
+여러 프로세스를 사용하는 MCTS
+
+루트 병렬화: 각 프로세스가 같은 루트에서 서로 다른 시드로 독립적인 트리를 만들고,
+부모 프로세스가 루트 자식의 방문 횟수/가치를 행동별로 합쳐 수를 고른다.
+트리 병렬화: 공유 메모리에 저장한 트리 하나를 여러 프로세스가 가상 손실을 걸며 함께 키운다.
+
+워커는 spawn 방식(Windows/macOS 기본)에서 실행 중인 메인 모듈을 다시 import 하므로,
+import 시점에 게임 창을 여는 main.py 에서는 fork 를 쓰는 Linux 에서만 사용한다.
+"""
+import math
+import multiprocessing
+import os
+import queue
+import random
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from quarto_mcts import Node, check_playable, mcts, most_visited_action, simulate
+from quarto_symmetry import canonical_actions
+
+
+def _reseed(evaluate, seed):
+    # 평가 함수가 자체 난수 발생기를 가지면 (BatchRollout) 워커 시드로 다시 설정
+    reseed = getattr(evaluate, 'reseed', None)
+    if reseed is not None:
+        reseed(seed)
+
+
+def _search_worker(state, seed, simulation_count, time_limit, mcts_kwargs):
+    random.seed(seed)
+    _reseed(mcts_kwargs.get('evaluate'), seed)
+    root = Node(state)
+    mcts(state, simulation_count=simulation_count, time_limit=time_limit, root=root, **mcts_kwargs)
+    return {action: (child.visits, child.value) for action, child in root.children.items()}
+
+
+def merge_root_stats(results):
+    """
+    워커별 {행동: (방문 횟수, 가치 합계)} 를 행동별로 합침
+    """
+    merged = {}
+    for stats in results:
+        for action, (visits, value) in stats.items():
+            total_visits, total_value = merged.get(action, (0, 0))
+            merged[action] = (total_visits + visits, total_value + value)
+    return merged
+
+
+class RootParallelMCTS:
+    """
+    프로세스 풀을 유지하며 루트 병렬 MCTS 를 수행
+    """
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = None
+        self.last_stats = {}  # 마지막 탐색의 합쳐진 루트 통계
+
+    def search(self, state, simulation_count=10000, time_limit=None, **mcts_kwargs):
+        """
+        state 에서 둘 행동 반환
+
+        simulation_count 는 전체 시뮬레이션 수로 워커에 나누어 주고,
+        time_limit 를 주면 모든 워커가 그 시간 동안 탐색한다.
+        """
+        check_playable(state)
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        per_worker = None if simulation_count is None else max(1, simulation_count // self.workers)
+        futures = [
+            self.executor.submit(_search_worker, state, random.getrandbits(32), per_worker, time_limit, mcts_kwargs)
+            for _ in range(self.workers)
+        ]
+        self.last_stats = merge_root_stats(future.result() for future in futures)
+        return most_visited_action(state, {action: visits for action, (visits, _) in self.last_stats.items()})
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+
+# 트리 병렬화: 공유 메모리 노드 배열
+UNEXPANDED = 0
+EXPANDED = 1
+
+_ARENA_FIELDS = (
+    ('visits', np.int64),
+    ('value', np.float64),
+    ('virtual_loss', np.int64),  # 이 노드를 지나 아직 역전파하지 않은 시뮬레이션 수
+    ('first_child', np.int64),  # 자식 블록 시작 인덱스
+    ('num_children', np.int64),
+    ('action', np.int64),  # 부모에서 이 노드로 온 행동
+    ('expanded', np.int64),
+)
+
+
+class NodeArena:
+    """
+    multiprocessing.shared_memory 에 필드별 배열로 저장한 탐색 트리
+
+    노드는 인덱스(루트 0)이고 자식은 연속된 블록으로 할당한다. 상태는 저장하지 않고
+    루트에서 행동을 다시 적용해 만든다. name 을 주면 기존 공유 메모리에 연결한다.
+    """
+    def __init__(self, capacity, name=None):
+        self.capacity = capacity
+        create = name is None
+        size = capacity * 8 * len(_ARENA_FIELDS) + 8
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+        offset = 0
+        for field, dtype in _ARENA_FIELDS:
+            setattr(self, field, np.ndarray((capacity,), dtype=dtype, buffer=self.shm.buf, offset=offset))
+            offset += capacity * 8
+        self.size = np.ndarray((1,), dtype=np.int64, buffer=self.shm.buf, offset=offset)  # 할당된 노드 수
+        if create:
+            for field, _ in _ARENA_FIELDS:
+                getattr(self, field)[:] = 0
+            self.size[0] = 1
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def reset(self):
+        """
+        할당된 노드를 모두 지우고 루트만 남김 (다음 수에서 같은 공유 메모리를 다시 사용)
+        """
+        used = int(self.size[0])
+        for field, _ in _ARENA_FIELDS:
+            getattr(self, field)[:used] = 0
+        self.size[0] = 1
+
+    def expand(self, node, actions):
+        """
+        node 의 자식 블록을 할당 (잠금을 잡은 상태에서 호출). 공간이 없으면 False
+        """
+        start = int(self.size[0])
+        count = len(actions)
+        if start + count > self.capacity:
+            return False
+        self.size[0] = start + count
+        self.action[start:start + count] = actions
+        self.first_child[node] = start
+        self.num_children[node] = count
+        self.expanded[node] = EXPANDED
+        return True
+
+    def select_child(self, node, exploration_weight, virtual_loss):
+        """
+        가상 손실을 방문(보상 0)으로 더한 UCT 로 자식 선택
+        """
+        # 자식 수가 16 이하라 NumPy 연산보다 리스트로 꺼내 계산하는 편이 빠르다
+        start = int(self.first_child[node])
+        end = start + int(self.num_children[node])
+        visits = [
+            n + virtual_loss * v
+            for n, v in zip(self.visits[start:end].tolist(), self.virtual_loss[start:end].tolist())
+        ]
+        unvisited = [i for i, n in enumerate(visits) if n <= 0]
+        if unvisited:
+            return start + random.choice(unvisited)
+        # Node.uct_value 처럼 부모 방문 수 (가상 손실 포함) 의 로그 사용
+        parent_visits = int(self.visits[node]) + virtual_loss * int(self.virtual_loss[node])
+        log_visits = math.log(max(parent_visits, 1))
+        best, best_uct = 0, -1.0
+        for i, (n, value) in enumerate(zip(visits, self.value[start:end].tolist())):
+            uct = value / n + exploration_weight * math.sqrt(log_visits / n)
+            if uct > best_uct:
+                best, best_uct = i, uct
+        return start + best
+
+    def close(self):
+        # numpy 배열이 버퍼를 잡고 있으면 닫을 수 없으므로 먼저 해제
+        for field, _ in _ARENA_FIELDS:
+            setattr(self, field, None)
+        self.size = None
+        self.shm.close()
+
+    def unlink(self):
+        self.shm.unlink()
+
+
+def _flush_backprop(arena, lock, pending):
+    # 모아 둔 (경로 노드 배열, 경로별 보상 배열) 을 한 번의 잠금으로 역전파하고 가상 손실 해제
+    if not pending:
+        return
+    indices = np.concatenate([path for path, _ in pending])
+    values = np.concatenate([rewards for _, rewards in pending])
+    with lock:
+        np.add.at(arena.visits, indices, 1)
+        np.add.at(arena.value, indices, values)
+        np.add.at(arena.virtual_loss, indices, -1)
+    pending.clear()
+
+
+def _tree_search(arena, lock, state, seed, simulation_count, deadline, max_depth, exploration_weight,
+                 virtual_loss, check_interval, backprop_batch, evaluate):
+    """
+    공유 트리에서 시뮬레이션을 반복하고 반복 횟수 반환
+
+    선택은 잠금 없이 하고, 반복마다 한 번 잠금을 잡아 리프 확장과 경로 전체의 가상 손실을
+    함께 건다. 역전파는 backprop_batch 번 모아 한 번의 잠금으로 반영한다.
+    """
+    random.seed(seed)
+    if evaluate is None:
+        evaluate = simulate
+    _reseed(evaluate, seed)
+    player = state.player
+    pending = []
+    iterations = count() if simulation_count is None else range(simulation_count)
+    done = 0
+    try:
+        for i in iterations:
+            if deadline is not None and i % check_interval == 0 and time.time() >= deadline:
+                break
+
+            # 1: 선택 - 잠금 없이 확장된 노드를 따라 내려감 (다른 워커의 가상 손실을 피함)
+            node = 0
+            node_state = state
+            path = [0]
+            movers = [-1]  # 그 노드로 오는 행동을 한 플레이어
+            depth = 0
+            while depth < max_depth and arena.expanded[node] == EXPANDED and not node_state.is_terminal():
+                child = arena.select_child(node, exploration_weight, virtual_loss)
+                movers.append(node_state.player)
+                node_state = node_state.perform_action(int(arena.action[child]))
+                node = child
+                path.append(node)
+                depth += 1
+
+            # 2: 확장과 가상 손실 - 반복마다 한 번의 잠금
+            with lock:
+                if depth < max_depth and not node_state.is_terminal():
+                    if arena.expanded[node] == EXPANDED or arena.expand(node, node_state.get_possible_actions()):
+                        child = arena.select_child(node, exploration_weight, virtual_loss)
+                        movers.append(node_state.player)
+                        node_state = node_state.perform_action(int(arena.action[child]))
+                        path.append(child)
+                path = np.array(path, dtype=np.int64)
+                arena.virtual_loss[path] += 1  # 경로의 노드는 서로 다름
+
+            # 3: 시뮬레이션
+            value = evaluate(node_state, player)
+
+            # 4: 역전파 (backprop_batch 번마다 모아서)
+            pending.append((path, np.where(np.array(movers) == player, value, 1 - value)))
+            done += 1
+            if len(pending) >= backprop_batch:
+                _flush_backprop(arena, lock, pending)
+    finally:
+        _flush_backprop(arena, lock, pending)
+    return done
+
+
+def _tree_worker(arena_name, capacity, lock, tasks, results):
+    # 탐색 요청을 기다렸다가 실행하는 상주 워커 (None 을 받으면 종료)
+    arena = NodeArena(capacity, name=arena_name)
+    try:
+        while True:
+            try:
+                task = tasks.get()
+                if task is None:
+                    break
+                results.put(('ok', _tree_search(arena, lock, *task)))
+            except Exception:
+                results.put(('error', traceback.format_exc()))
+    finally:
+        arena.close()
+
+
+class TreeParallelMCTS:
+    """
+    여러 프로세스가 공유 메모리의 트리 하나를 함께 키우는 트리 병렬 MCTS
+
+    워커마다 같은 트리에서 선택하되 지나가는 노드에 가상 손실을 걸어 서로 다른
+    가지를 탐색하게 한다. 워커 프로세스와 공유 메모리는 처음 탐색할 때 만들어
+    close() 까지 유지하고, 트리 내용은 수마다 비운다.
+    """
+    def __init__(self, workers=None, capacity=500000, virtual_loss=1, backprop_batch=8):
+        self.workers = workers or os.cpu_count() or 1
+        self.capacity = capacity  # 트리 최대 노드 수
+        self.virtual_loss = virtual_loss  # 지나가는 시뮬레이션 하나당 더하는 가상 방문 수
+        self.backprop_batch = backprop_batch  # 워커가 한 번에 역전파하는 시뮬레이션 수
+        self.last_stats = {}  # 마지막 탐색의 루트 통계
+        self.arena = None
+        self.processes = []
+
+    def _start(self):
+        self.arena = NodeArena(self.capacity)
+        self.lock = multiprocessing.Lock()
+        self.tasks = multiprocessing.Queue()
+        self.results = multiprocessing.Queue()
+        self.processes = [
+            multiprocessing.Process(target=_tree_worker,
+                                    args=(self.arena.name, self.capacity, self.lock, self.tasks, self.results),
+                                    daemon=True)
+            for _ in range(self.workers)
+        ]
+        for process in self.processes:
+            process.start()
+
+    def _collect(self):
+        # 워커마다 결과 하나를 받음 (워커가 죽었거나 탐색 중 예외가 나면 RuntimeError)
+        errors = []
+        received = 0
+        while received < self.workers:
+            try:
+                status, result = self.results.get(timeout=1.0)
+            except queue.Empty:
+                dead = [process.exitcode for process in self.processes if not process.is_alive()]
+                if dead:
+                    self.close()
+                    raise RuntimeError(f"{len(dead)} tree search worker(s) exited (exit codes {dead})")
+                continue
+            received += 1
+            if status == 'error':
+                errors.append(result)
+        if errors:
+            raise RuntimeError(f"{len(errors)} tree search worker(s) failed:\n{errors[0]}")
+
+    def search(self, state, simulation_count=10000, time_limit=None, max_depth=7,
+               exploration_weight=1.4, root_symmetry=False, check_interval=64, evaluate=None):
+        """
+        state 에서 둘 행동 반환 (simulation_count 는 전체 시뮬레이션 수)
+        """
+        check_playable(state)
+        deadline = time.time() + time_limit if time_limit is not None else None
+        per_worker = None if simulation_count is None else max(1, simulation_count // self.workers)
+        if self.arena is None:
+            self._start()
+        arena = self.arena
+        arena.reset()
+        # 루트는 미리 확장 (대칭으로 같은 행동은 하나만)
+        actions = canonical_actions(state) if root_symmetry else state.get_possible_actions()
+        arena.expand(0, actions)
+
+        for _ in range(self.workers):
+            self.tasks.put((state, random.getrandbits(32), per_worker, deadline, max_depth, exploration_weight,
+                            self.virtual_loss, check_interval, self.backprop_batch, evaluate))
+        self._collect()
+
+        start = int(arena.first_child[0])
+        self.last_stats = {
+            int(arena.action[index]): (int(arena.visits[index]), float(arena.value[index]))
+            for index in range(start, start + int(arena.num_children[0]))
+        }
+        return most_visited_action(state, {action: visits for action, (visits, _) in self.last_stats.items()})
+
+    def close(self):
+        if self.arena is None:
+            return
+        for process in self.processes:
+            if process.is_alive():
+                self.tasks.put(None)
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self.processes = []
+        self.arena.close()
+        self.arena.unlink()
+        self.arena = None
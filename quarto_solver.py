@@ -0,0 +1,164 @@
+"""
+빈칸이 적게 남은 후반 상태를 끝까지 읽는 negamax alpha-beta 풀이기
+
+값은 행동할 플레이어 관점으로 승리 1, 무승부 0, 패배 -1 이다.
+"""
+import time
+
+from quarto_state import FULL_MASK, LINE_UPDATES, PIECE_CELL_BITS, iter_bits, line_tactics
+
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+
+class SolverTimeout(Exception):
+    pass
+
+
+class EndgameSolver:
+    """
+    메모 테이블을 가진 후반 풀이기
+
+    같은 게임에서 계속 사용하면 이전 수에서 계산한 값을 다시 쓴다.
+    메모 키는 대칭 정규화하지 않는다. 풀이가 도는 빈 칸 9개 이하에서는 대칭인 형세가
+    거의 나오지 않아 canonical_key 비용만 늘어난다.
+    """
+    def __init__(self, max_memo_size=2000000, check_interval=1024):
+        self.memo = {}  # 키 -> (값, 종류)
+        self.max_memo_size = max_memo_size
+        self.check_interval = check_interval
+        self.nodes = 0  # 탐색한 노드 수
+        self.deadline = None
+
+    def solve(self, state, time_limit=None):
+        """
+        GameState 를 끝까지 풀어 (값, 최선의 행동) 반환
+        time_limit(초) 안에 끝나지 않으면 None 반환
+        """
+        if len(self.memo) > self.max_memo_size:
+            self.memo.clear()
+        self.deadline = time.perf_counter() + time_limit if time_limit is not None else None
+
+        board = state.board
+        occupied, attrs, lines = board.occupied, board.attrs, board.lines
+        try:
+            if state.selected < 0:
+                return self._solve_select_root(occupied, attrs, lines, board.available)
+            return self._solve_place_root(occupied, attrs, lines, board.available & ~(1 << state.selected),
+                                          state.selected)
+        except SolverTimeout:
+            return None
+
+    def _solve_place_root(self, occupied, attrs, lines, available, piece_id):
+        empties = FULL_MASK & ~occupied
+        wins = line_tactics(occupied, lines, piece_id)[1]
+        if wins:
+            return 1, (wins & -wins).bit_length() - 1
+        best_value, best_cell = -2, -1
+        for cell in iter_bits(empties):
+            new_occupied = occupied | (1 << cell)
+            if new_occupied == FULL_MASK:
+                value = 0
+            else:
+                value = self._select_value(new_occupied, attrs | PIECE_CELL_BITS[piece_id][cell],
+                                           lines & LINE_UPDATES[piece_id][cell], available, best_value, 1)
+            if value > best_value:
+                best_value, best_cell = value, cell
+                if value == 1:
+                    break
+        return best_value, best_cell
+
+    def _solve_select_root(self, occupied, attrs, lines, available):
+        safe = available & ~line_tactics(occupied, lines)[0]
+        if not safe:
+            # 어떤 말을 줘도 상대가 바로 이김
+            return -1, (available & -available).bit_length() - 1
+        best_value, best_piece = -2, -1
+        for piece_id in iter_bits(safe):
+            value = -self._place_value(occupied, attrs, lines, available & ~(1 << piece_id), piece_id, -1, -best_value)
+            if value > best_value:
+                best_value, best_piece = value, piece_id
+                if value == 1:
+                    break
+        return best_value, best_piece
+
+    def _tick(self):
+        self.nodes += 1
+        if self.deadline is not None and self.nodes % self.check_interval == 0:
+            if time.perf_counter() >= self.deadline:
+                raise SolverTimeout()
+
+    def _lookup(self, key, alpha, beta):
+        entry = self.memo.get(key)
+        if entry is None:
+            return None, alpha, beta
+        value, flag = entry
+        if flag == EXACT:
+            return value, alpha, beta
+        if flag == LOWER:
+            alpha = max(alpha, value)
+        else:
+            beta = min(beta, value)
+        if alpha >= beta:
+            return value, alpha, beta
+        return None, alpha, beta
+
+    def _store(self, key, value, alpha, beta):
+        if value <= alpha:
+            self.memo[key] = (value, UPPER)
+        elif value >= beta:
+            self.memo[key] = (value, LOWER)
+        else:
+            self.memo[key] = (value, EXACT)
+
+    def _place_value(self, occupied, attrs, lines, available, piece_id, alpha, beta):
+        # piece_id 를 받아 놓는 플레이어 관점 값 (available 에는 piece_id 제외)
+        # 선택 단계에서 안전한 말만 건네므로 바로 이기는 칸은 없다
+        self._tick()
+        empties = FULL_MASK & ~occupied
+        piece_bits = PIECE_CELL_BITS[piece_id]
+        line_updates = LINE_UPDATES[piece_id]
+        if not available:
+            return 0  # 마지막 칸을 채우고 승부가 나지 않음
+
+        key = (attrs << 21) | (occupied << 5) | (piece_id + 1)
+        cached, alpha, beta = self._lookup(key, alpha, beta)
+        if cached is not None:
+            return cached
+
+        original_alpha = alpha
+        best = -1
+        for cell in iter_bits(empties):
+            value = self._select_value(occupied | (1 << cell), attrs | piece_bits[cell], lines & line_updates[cell],
+                                       available, alpha, beta)
+            if value > best:
+                best = value
+                if best > alpha:
+                    alpha = best
+                if alpha >= beta:
+                    break
+        self._store(key, best, original_alpha, beta)
+        return best
+
+    def _select_value(self, occupied, attrs, lines, available, alpha, beta):
+        # 상대에게 줄 말을 고르는 플레이어 관점 값
+        self._tick()
+        key = (attrs << 21) | (occupied << 5)
+        cached, alpha, beta = self._lookup(key, alpha, beta)
+        if cached is not None:
+            return cached
+
+        original_alpha = alpha
+        best = -1  # 모든 말이 상대에게 즉시 승리를 주면 패배
+        # 상대가 바로 이길 수 있는 말은 건네지 않음
+        for piece_id in iter_bits(available & ~line_tactics(occupied, lines)[0]):
+            value = -self._place_value(occupied, attrs, lines, available & ~(1 << piece_id), piece_id, -beta, -alpha)
+            if value > best:
+                best = value
+                if best > alpha:
+                    alpha = best
+                if alpha >= beta:
+                    break
+        self._store(key, best, original_alpha, beta)
+        return best
@@ -0,0 +1,352 @@
+"""
+비트보드 기반 Quarto 게임 상태
+
+보드의 16칸은 cell = row * 4 + col 로 번호를 매기고, 말은 main.py 의 pieces
+리스트와 같은 순서(piece_id = i*8 + j*4 + k*2 + l)로 0~15 번호를 사용한다.
+main.py 의 보드 값은 piece_id + 1 이다.
+"""
+import random
+
+BOARD_ROWS = 4
+BOARD_COLS = 4
+NUM_CELLS = BOARD_ROWS * BOARD_COLS
+NUM_PIECES = 16
+NUM_ATTRS = 4  # I/E, N/S, T/F, P/J
+FULL_MASK = (1 << NUM_CELLS) - 1
+
+# MBTI 말 (main.py 와 같은 순서)
+PIECES = [(i, j, k, l) for i in range(2) for j in range(2) for k in range(2) for l in range(2)]
+
+# 말 piece_id 를 칸 cell 에 놓았을 때 attrs 에 더해지는 비트
+# attrs 는 특성마다 16비트씩(특성 a 는 a*16 비트부터) 해당 특성이 1인 칸을 표시한다
+PIECE_CELL_BITS = [
+    [
+        sum(((piece_id >> (NUM_ATTRS - 1 - a)) & 1) << (a * NUM_CELLS + cell) for a in range(NUM_ATTRS))
+        for cell in range(NUM_CELLS)
+    ]
+    for piece_id in range(NUM_PIECES)
+]
+
+# 말 piece_id 의 라인 코드: 하위 4비트 = 특성 값, 상위 4비트 = 뒤집은 특성 값
+# 라인에 놓인 말들의 코드를 AND 하면 0 이 아닌 비트가 그 말들이 공유하는 특성이다
+PIECE_CODES = [piece_id | ((piece_id ^ 15) << 4) for piece_id in range(NUM_PIECES)]
+
+# SHARED_PIECES[shared]: 공통 특성 코드 shared 중 하나라도 가진 말들의 마스크
+SHARED_PIECES = [
+    sum(1 << piece_id for piece_id in range(NUM_PIECES) if PIECE_CODES[piece_id] & shared)
+    for shared in range(256)
+]
+
+# Zobrist 해시용 난수 (고정 시드라 실행마다 같은 값)
+_zobrist_rng = random.Random(20241017)
+ZOBRIST_PIECE_CELL = [[_zobrist_rng.getrandbits(64) for _ in range(NUM_CELLS)] for _ in range(NUM_PIECES)]
+ZOBRIST_SELECTED = [_zobrist_rng.getrandbits(64) for _ in range(NUM_PIECES + 1)]  # 인덱스 selected + 1
+ZOBRIST_PLAYER = _zobrist_rng.getrandbits(64)
+
+
+def _line_mask(cells):
+    mask = 0
+    for row, col in cells:
+        mask |= 1 << (row * BOARD_COLS + col)
+    return mask
+
+
+# 승리 라인 19개: 가로 4, 세로 4, 대각선 2, 2x2 부분 격자 9
+WIN_LINES = (
+    [_line_mask([(row, col) for col in range(BOARD_COLS)]) for row in range(BOARD_ROWS)]
+    + [_line_mask([(row, col) for row in range(BOARD_ROWS)]) for col in range(BOARD_COLS)]
+    + [_line_mask([(i, i) for i in range(BOARD_ROWS)]),
+       _line_mask([(i, BOARD_ROWS - i - 1) for i in range(BOARD_ROWS)])]
+    + [_line_mask([(r, c), (r, c + 1), (r + 1, c), (r + 1, c + 1)])
+       for r in range(BOARD_ROWS - 1) for c in range(BOARD_COLS - 1)]
+)
+
+# 라인별 (라인 마스크, 특성 a 위치로 이동한 라인 마스크 4개)
+_LINE_TABLE = [
+    (line, tuple(line << (a * NUM_CELLS) for a in range(NUM_ATTRS)))
+    for line in WIN_LINES
+]
+
+# 칸마다 그 칸을 지나는 라인 (놓은 칸의 라인만 다시 검사하기 위한 색인)
+CELL_LINES = [
+    [entry for entry in _LINE_TABLE if (entry[0] >> cell) & 1]
+    for cell in range(NUM_CELLS)
+]
+
+# 라인 상태: 라인 l 의 공통 특성 코드를 l*8 비트부터 8비트씩 묶은 정수 (빈 라인은 0xFF)
+EMPTY_LINES = sum(0xFF << (8 * index) for index in range(len(WIN_LINES)))
+
+# 라인별 (라인 마스크, 라인 상태에서의 비트 위치)
+_LINE_SHIFTS = [(line, 8 * index) for index, line in enumerate(WIN_LINES)]
+
+# 칸마다 그 칸을 지나는 라인의 (라인 상태에서의 비트 위치, 나머지 세 칸 마스크) (undo 에서 그 라인만 다시 계산)
+_CELL_LINE_REST = [
+    [(8 * index, line & ~(1 << cell)) for index, line in enumerate(WIN_LINES) if (line >> cell) & 1]
+    for cell in range(NUM_CELLS)
+]
+
+# 특성 a 의 (attrs 에서의 비트 위치, 값 1 을 공유할 때의 코드 비트, 값 0 을 공유할 때의 코드 비트)
+_ATTR_CODE_BITS = [(a * NUM_CELLS, 1 << (NUM_ATTRS - 1 - a), 0x10 << (NUM_ATTRS - 1 - a)) for a in range(NUM_ATTRS)]
+
+# LINE_UPDATES[piece][cell]: 말을 놓을 때 라인 상태에 AND 하는 마스크 (cell 을 지나는 라인만 바뀜)
+LINE_UPDATES = [
+    [
+        EMPTY_LINES & ~sum((0xFF & ~PIECE_CODES[piece_id]) << (8 * index)
+                           for index, line in enumerate(WIN_LINES) if (line >> cell) & 1)
+        for cell in range(NUM_CELLS)
+    ]
+    for piece_id in range(NUM_PIECES)
+]
+
+
+def _check_lines(occupied, attrs, lines):
+    for line, shifted in lines:
+        if occupied & line != line:
+            continue  # 빈칸이 있는 라인
+        for mask in shifted:
+            common = attrs & mask
+            if common == mask or common == 0:  # 네 말의 특성이 모두 1 또는 모두 0
+                return True
+    return False
+
+
+def has_win(occupied, attrs):
+    """
+    보드 전체에 완성된 승리 라인이 있는지 확인
+    """
+    return _check_lines(occupied, attrs, _LINE_TABLE)
+
+
+def wins_at(occupied, attrs, cell):
+    """
+    cell 을 지나는 라인 중 완성된 승리 라인이 있는지 확인
+    """
+    return _check_lines(occupied, attrs, CELL_LINES[cell])
+
+
+def line_tactics(occupied, lines, piece_id=-1, count_lines=False):
+    """
+    라인 상태(QuartoState.lines)를 한 번 훑어
+    (바로 지게 되는 말 마스크, piece_id 로 바로 이기는 칸 마스크,
+     공통 특성이 있는 3칸 라인 수, 공통 특성이 있는 2칸 라인 수) 반환
+    2칸 라인 수는 count_lines 일 때만 센다 (플레이아웃에서는 세지 않아 빠르게).
+    """
+    unsafe = wins = 0
+    triples = doubles = 0
+    code = PIECE_CODES[piece_id] if piece_id >= 0 else 0
+    for line, shift in _LINE_SHIFTS:
+        empty = line & ~occupied
+        rest = empty & (empty - 1)
+        if rest:
+            if count_lines and not rest & (rest - 1) and (lines >> shift) & 0xFF:
+                doubles += 1  # 빈칸이 정확히 둘
+            continue
+        if not empty:
+            continue
+        # 빈칸이 정확히 하나
+        shared = (lines >> shift) & 0xFF
+        if shared:
+            triples += 1
+            unsafe |= SHARED_PIECES[shared]
+            if shared & code:
+                wins |= empty
+    return unsafe, wins, triples, doubles
+
+
+def piece_index(piece):
+    """
+    말 튜플 (예: (1, 0, 1, 0)) 을 piece_id 로 변환
+    """
+    return (piece[0] << 3) | (piece[1] << 2) | (piece[2] << 1) | piece[3]
+
+
+def cell_index(row, col):
+    """
+    (row, col) 좌표를 칸 번호로 변환
+    """
+    return row * BOARD_COLS + col
+
+
+def cell_to_rc(cell):
+    """
+    칸 번호를 (row, col) 좌표로 변환
+    """
+    return divmod(cell, BOARD_COLS)
+
+
+def iter_bits(mask):
+    """
+    mask 에 설정된 비트 번호를 낮은 순서부터 반환
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class QuartoState:
+    """
+    불변(immutable) 보드 상태
+
+    occupied: 말이 놓인 칸 (16비트)
+    attrs: 특성별로 값이 1인 칸 (16비트 x 4)
+    available: 아직 보드에 놓이지 않은 말 (16비트)
+    zobrist: 놓인 (칸, 말) 들의 Zobrist 해시 (place/undo 에서 갱신)
+    lines: 라인별 공통 특성 코드 (place 에서 AND 한 번으로, undo 에서 칸을 지나는 라인만 갱신)
+    """
+    __slots__ = ('occupied', 'attrs', 'available', 'zobrist', 'lines')
+
+    def __init__(self, occupied=0, attrs=0, available=(1 << NUM_PIECES) - 1, zobrist=None, lines=None):
+        self.occupied = occupied
+        self.attrs = attrs
+        self.available = available
+        if zobrist is None or lines is None:
+            zobrist = 0
+            lines = EMPTY_LINES
+            for cell in iter_bits(occupied):
+                piece_id = self.piece_at(cell)
+                zobrist ^= ZOBRIST_PIECE_CELL[piece_id][cell]
+                lines &= LINE_UPDATES[piece_id][cell]
+        self.zobrist = zobrist
+        self.lines = lines
+
+    @classmethod
+    def from_board(cls, board, available_pieces=None):
+        """
+        main.py 형식의 보드 (0: 빈칸, 1~16: 말 인덱스 + 1) 로부터 상태 생성
+        available_pieces 를 주지 않으면 보드에 없는 모든 말을 사용 가능으로 본다
+        """
+        occupied = 0
+        attrs = 0
+        used = 0
+        for row in range(BOARD_ROWS):
+            for col in range(BOARD_COLS):
+                value = int(board[row][col])
+                if value != 0:
+                    cell = cell_index(row, col)
+                    occupied |= 1 << cell
+                    attrs |= PIECE_CELL_BITS[value - 1][cell]
+                    used |= 1 << (value - 1)
+        if available_pieces is None:
+            available = ((1 << NUM_PIECES) - 1) & ~used
+        else:
+            available = 0
+            for piece in available_pieces:
+                available |= 1 << piece_index(piece)
+        return cls(occupied, attrs, available)
+
+    def to_board(self):
+        """
+        main.py 형식의 4x4 리스트 보드로 변환
+        """
+        board = [[0] * BOARD_COLS for _ in range(BOARD_ROWS)]
+        for cell in iter_bits(self.occupied):
+            row, col = cell_to_rc(cell)
+            board[row][col] = self.piece_at(cell) + 1
+        return board
+
+    def piece_at(self, cell):
+        """
+        칸에 놓인 말의 piece_id 반환 (빈칸이면 -1)
+        """
+        if not (self.occupied >> cell) & 1:
+            return -1
+        attrs = self.attrs
+        piece_id = 0
+        for a in range(NUM_ATTRS):
+            piece_id = (piece_id << 1) | ((attrs >> (a * NUM_CELLS + cell)) & 1)
+        return piece_id
+
+    def place(self, cell, piece_id):
+        """
+        cell 에 piece_id 말을 놓은 새 상태 반환
+        """
+        return QuartoState(
+            self.occupied | (1 << cell),
+            self.attrs | PIECE_CELL_BITS[piece_id][cell],
+            self.available & ~(1 << piece_id),
+            self.zobrist ^ ZOBRIST_PIECE_CELL[piece_id][cell],
+            self.lines & LINE_UPDATES[piece_id][cell],
+        )
+
+    def undo(self, cell):
+        """
+        cell 에 놓인 말을 되돌린 새 상태 반환
+        AND 는 되돌릴 수 없으므로 cell 을 지나는 라인 (최대 7개) 의 공통 특성 코드만 나머지 칸으로 다시 계산한다.
+        """
+        piece_id = self.piece_at(cell)
+        occupied = self.occupied & ~(1 << cell)
+        attrs = self.attrs & ~PIECE_CELL_BITS[piece_id][cell]
+        lines = self.lines
+        for shift, rest in _CELL_LINE_REST[cell]:
+            filled = rest & occupied
+            shared = 0xFF
+            if filled:
+                shared = 0
+                for attr_shift, one_bit, zero_bit in _ATTR_CODE_BITS:
+                    ones = (attrs >> attr_shift) & filled
+                    if ones == filled:
+                        shared |= one_bit
+                    elif not ones:
+                        shared |= zero_bit
+            lines = (lines & ~(0xFF << shift)) | (shared << shift)
+        return QuartoState(
+            occupied,
+            attrs,
+            self.available | (1 << piece_id),
+            self.zobrist ^ ZOBRIST_PIECE_CELL[piece_id][cell],
+            lines,
+        )
+
+    def empty_mask(self):
+        return FULL_MASK & ~self.occupied
+
+    def empty_cells(self):
+        return list(iter_bits(FULL_MASK & ~self.occupied))
+
+    def available_pieces(self):
+        return list(iter_bits(self.available))
+
+    def num_empty(self):
+        return NUM_CELLS - bin(self.occupied).count('1')
+
+    def is_full(self):
+        return self.occupied == FULL_MASK
+
+    def has_win(self):
+        return _check_lines(self.occupied, self.attrs, _LINE_TABLE)
+
+    def wins_at(self, cell):
+        """
+        cell 에 마지막으로 말을 놓았을 때의 승리 여부 (cell 을 지나는 라인만 검사)
+        """
+        return _check_lines(self.occupied, self.attrs, CELL_LINES[cell])
+
+    def unsafe_pieces(self):
+        """
+        아직 놓이지 않은 말 중 상대에게 주면 바로 지는 말 마스크
+        """
+        return line_tactics(self.occupied, self.lines)[0] & self.available
+
+    def safe_pieces(self):
+        return self.available & ~line_tactics(self.occupied, self.lines)[0]
+
+    def key(self):
+        """
+        상태를 하나의 정수로 묶은 값 (해시/테이블 키로 사용)
+        """
+        return self.occupied | (self.available << NUM_CELLS) | (self.attrs << (2 * NUM_CELLS))
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, QuartoState)
+            and self.occupied == other.occupied
+            and self.attrs == other.attrs
+            and self.available == other.available
+        )
+
+    def __hash__(self):
+        return hash((self.zobrist, self.available))
+
+    def __repr__(self):
+        return f"QuartoState(occupied={self.occupied:#06x}, attrs={self.attrs:#018x}, available={self.available:#06x})"
@@ -0,0 +1,153 @@
+"""
+Quarto 상태의 대칭 정규화
+
+보드 대칭: 승리 라인 19개(가로/세로/대각선/2x2)를 라인으로 옮기는 칸 치환.
+행/열 치환과 전치로 만들 수 있는 후보 중 WIN_LINES 를 보존하는 것만 남긴다.
+일반 Quarto 의 안팎 뒤집기 같은 추가 대칭은 2x2 라인을 보존하지 않아 빠지고,
+결과적으로 회전/대칭 8개(D4)가 남는다.
+
+말 대칭: 네 특성의 순서 바꾸기(24) x 특성별 0/1 뒤집기(16).
+"""
+from itertools import permutations
+
+from quarto_state import (
+    BOARD_COLS, BOARD_ROWS, NUM_ATTRS, NUM_CELLS, NUM_PIECES, WIN_LINES, ZOBRIST_PIECE_CELL, ZOBRIST_SELECTED,
+    iter_bits,
+)
+
+
+def _find_board_symmetries():
+    lines = set(WIN_LINES)
+    symmetries = []
+    for row_perm in permutations(range(BOARD_ROWS)):
+        for col_perm in permutations(range(BOARD_COLS)):
+            for transpose in (False, True):
+                cell_map = []
+                for row in range(BOARD_ROWS):
+                    for col in range(BOARD_COLS):
+                        new_row, new_col = row_perm[row], col_perm[col]
+                        if transpose:
+                            new_row, new_col = new_col, new_row
+                        cell_map.append(new_row * BOARD_COLS + new_col)
+                mapped = set()
+                for line in lines:
+                    mapped.add(sum(1 << cell_map[cell] for cell in range(NUM_CELLS) if (line >> cell) & 1))
+                if mapped == lines and tuple(cell_map) not in symmetries:
+                    symmetries.append(tuple(cell_map))
+    return symmetries
+
+
+# BOARD_SYMMETRIES[s][cell]: 대칭 s 로 옮겨진 칸
+BOARD_SYMMETRIES = _find_board_symmetries()
+# INVERSE_SYMMETRIES[s][cell]: 대칭 s 후 cell 에 오는 원래 칸
+INVERSE_SYMMETRIES = [
+    tuple(sym.index(cell) for cell in range(NUM_CELLS)) for sym in BOARD_SYMMETRIES
+]
+
+
+def _permute_bits(piece_id, attr_perm):
+    # 특성 a (상위 비트부터) 를 attr_perm[a] 자리로 옮김
+    result = 0
+    for a in range(NUM_ATTRS):
+        bit = (piece_id >> (NUM_ATTRS - 1 - a)) & 1
+        result |= bit << (NUM_ATTRS - 1 - attr_perm[a])
+    return result
+
+
+# PIECE_PERMS[k][piece_id]: 특성 순서 바꾸기 k 를 적용한 말
+PIECE_PERMS = [
+    tuple(_permute_bits(piece_id, attr_perm) for piece_id in range(NUM_PIECES))
+    for attr_perm in permutations(range(NUM_ATTRS))
+]
+
+
+def transform_cell(cell, transform):
+    """
+    canonical_key 가 반환한 transform 으로 원래 칸을 정규 상태의 칸으로 변환
+    """
+    return BOARD_SYMMETRIES[transform[0]][cell]
+
+
+def inverse_transform_cell(cell, transform):
+    """
+    정규 상태의 칸을 원래 칸으로 변환
+    """
+    return INVERSE_SYMMETRIES[transform[0]][cell]
+
+
+def transform_piece(piece_id, transform):
+    """
+    원래 말을 정규 상태의 말로 변환
+    """
+    return PIECE_PERMS[transform[1]][piece_id] ^ transform[2]
+
+
+def inverse_transform_piece(piece_id, transform):
+    """
+    정규 상태의 말을 원래 말로 변환
+    """
+    return PIECE_PERMS[transform[1]].index(piece_id ^ transform[2])
+
+
+def canonical_key(board, selected=-1):
+    """
+    (보드, 손에 든 말) 의 대칭 중 가장 작은 정수 표현과 그 변환 반환
+
+    키는 정규 칸 0~15 순서로 (말+1, 빈칸 0) 5비트씩, 마지막에 손에 든 말을 붙인 값이다.
+    보드 대칭마다 24개의 특성 순서를 시도하고, 뒤집기는 첫 번째 말(보드가 비었으면
+    손에 든 말)이 0000 이 되도록 고정한다 - 다른 뒤집기는 첫 자리에서 항상 더 크다.
+    transform = (보드 대칭, 특성 순서, 뒤집기 마스크)
+    """
+    pieces_at = [board.piece_at(cell) for cell in range(NUM_CELLS)]
+    best_key = None
+    best_transform = None
+    for sym_index, inverse in enumerate(INVERSE_SYMMETRIES):
+        seq = [pieces_at[cell] for cell in inverse]
+        first = selected
+        for piece_id in seq:
+            if piece_id >= 0:
+                first = piece_id
+                break
+        for perm_index, table in enumerate(PIECE_PERMS):
+            flip = table[first] if first >= 0 else 0
+            key = 0
+            for piece_id in seq:
+                key = (key << 5) | (0 if piece_id < 0 else (table[piece_id] ^ flip) + 1)
+            key = (key << 5) | (0 if selected < 0 else (table[selected] ^ flip) + 1)
+            if best_key is None or key < best_key:
+                best_key = key
+                best_transform = (sym_index, perm_index, flip)
+    return best_key, best_transform
+
+
+def canonical_hash(board, selected=-1):
+    """
+    (보드, 손에 든 말) 을 정규 상태로 옮긴 뒤의 64비트 Zobrist 해시와 변환 반환
+
+    대칭으로 같은 상태는 같은 해시를 가지므로 오프닝 북 등 디스크 표의 키로 쓴다.
+    """
+    _, transform = canonical_key(board, selected)
+    key = ZOBRIST_SELECTED[(transform_piece(selected, transform) if selected >= 0 else -1) + 1]
+    for cell in iter_bits(board.occupied):
+        key ^= ZOBRIST_PIECE_CELL[transform_piece(board.piece_at(cell), transform)][transform_cell(cell, transform)]
+    return key, transform
+
+
+def action_orbits(state):
+    """
+    GameState 의 가능한 행동을 대칭으로 같은 결과를 만드는 것끼리 묶은
+    {대표 행동: [같은 부류의 행동들]} 반환 (대표는 부류에서 처음 나온 행동)
+    """
+    orbits = {}
+    for action in state.get_possible_actions():
+        child = state.perform_action(action)
+        key, _ = canonical_key(child.board, child.selected)
+        orbits.setdefault(key, []).append(action)
+    return {actions[0]: actions for actions in orbits.values()}
+
+
+def canonical_actions(state):
+    """
+    GameState 의 가능한 행동 중 대칭으로 같은 결과를 만드는 것을 하나만 남김
+    """
+    return list(action_orbits(state))
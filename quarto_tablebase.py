@@ -0,0 +1,132 @@
+"""
+디스크에 저장하는 후반 테이블 (엔드게임 테이블베이스)
+
+빈칸이 max_empty 개 이하인 정규 상태의 게임 이론 값(승 1/무 0/패 -1)과 최선의 수를
+오프라인으로 계산해 오프닝 북과 같은 형식(정렬된 해시 + 압축 값)으로 저장한다.
+빈칸 K 개인 모든 상태는 너무 많으므로(K=4 에서도 10^15 개 이상) 무작위 게임으로
+빈칸이 K 개가 되는 상태를 뽑고, 그 아래 모든 상태를 EndgameSolver 로 풀어 채운다.
+
+전수 테이블이 아니라 표본 테이블이라 실제 대국의 상태는 대부분 테이블에 없고,
+풀이기가 빈칸 8 개 이하를 바로 풀기 때문에 에이전트는 이 테이블을 조회하지 않는다.
+풀이기 결과 검증, 학습 데이터 같은 오프라인 용도로 쓴다.
+
+예: python quarto_tablebase.py --output endgame_table.bin --max-empty 6 --games 500 -j 4
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from quarto_book import PackedTable, from_canonical_action, pack_entry, to_canonical_action, unpack_entry, write_table
+from quarto_mcts import GameState
+from quarto_solver import EndgameSolver
+from quarto_state import ZOBRIST_SELECTED, QuartoState
+from quarto_symmetry import canonical_hash
+
+TABLEBASE_MAGIC = b'QTB1'
+DEFAULT_TABLEBASE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'endgame_table.bin')
+
+
+class EndgameTablebase:
+    """
+    에이전트용 테이블 조회 (매개변수 = 테이블에 담긴 최대 빈칸 수)
+    """
+    def __init__(self, path=DEFAULT_TABLEBASE_PATH):
+        self.table = PackedTable(path, TABLEBASE_MAGIC)
+
+    def probe(self, state):
+        """
+        GameState 의 (값, 최선의 행동) (테이블에 없으면 None)
+        """
+        if state.board.num_empty() > self.table.param:
+            return None
+        key, transform = canonical_hash(state.board, state.selected)
+        entry = self.table.get(key)
+        if entry is None:
+            return None
+        action, value_code = unpack_entry(entry)
+        return value_code - 1, from_canonical_action(state, action, transform)
+
+
+def random_root(rng, max_empty):
+    """
+    승부가 나지 않고 빈칸이 max_empty 개가 될 때까지 무작위로 둔 (말 선택 단계) 상태
+    """
+    while True:
+        state = GameState(QuartoState())
+        while state.board.num_empty() > max_empty and not state.is_terminal():
+            state = state.perform_action(rng.choice(state.get_possible_actions()))
+        if not state.is_terminal():
+            return state
+
+
+def solve_subtree(root, entries, solver=None):
+    """
+    root 아래의 끝나지 않은 모든 상태를 풀어 entries {정규 해시: 값} 에 추가
+    """
+    solver = solver or EndgameSolver()
+    seen = set()
+    stack = [root]
+    while stack:
+        state = stack.pop()
+        raw_key = state.board.zobrist ^ ZOBRIST_SELECTED[state.selected + 1]
+        if raw_key in seen:
+            continue
+        seen.add(raw_key)
+        key, transform = canonical_hash(state.board, state.selected)
+        if key in entries:
+            continue
+        value, action = solver.solve(state)
+        entries[key] = pack_entry(to_canonical_action(state, action, transform), value + 1)
+        for action in state.get_possible_actions():
+            child = state.perform_action(action)
+            if not child.is_terminal():
+                stack.append(child)
+    return entries
+
+
+def _tablebase_worker(args):
+    max_empty, seeds = args
+    entries = {}
+    solver = EndgameSolver()
+    for seed in seeds:
+        solve_subtree(random_root(random.Random(seed), max_empty), entries, solver)
+    return entries
+
+
+def build_tablebase(max_empty=6, games=100, workers=1, seed=0):
+    """
+    무작위 게임 games 개에서 뽑은 상태 아래를 모두 풀어 {해시: 값} 반환
+    """
+    seeds = [seed + i for i in range(games)]
+    tasks = [(max_empty, seeds[i::workers]) for i in range(workers)]
+    entries = {}
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for result in executor.map(_tablebase_worker, tasks):
+                entries.update(result)
+    else:
+        entries = _tablebase_worker(tasks[0])
+    return entries
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the Quarto endgame tablebase")
+    parser.add_argument('--output', default=DEFAULT_TABLEBASE_PATH)
+    parser.add_argument('--max-empty', type=int, default=6, help="deepest position in the table (empty cells)")
+    parser.add_argument('--games', type=int, default=100, help="random games to sample root positions from")
+    parser.add_argument('-j', '--jobs', type=int, default=1, help="number of parallel processes")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    begin = time.time()
+    entries = build_tablebase(args.max_empty, args.games, args.jobs, args.seed)
+    write_table(args.output, TABLEBASE_MAGIC, args.max_empty, entries)
+    print(f"{len(entries)} positions -> {args.output} ({time.time() - begin:.0f}s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
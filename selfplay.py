@@ -0,0 +1,207 @@
+"""
+P1 자가 대국으로 학습용 국면 데이터를 만드는 CLI
+
+프로세스마다 P1 탐색으로 자기 자신과 대국하고, 게임이 끝날 때마다 그 게임의 국면들을
+고정 길이 레코드로 자기 샤드 파일(shard_XXX.bin)에 덧붙인다. 메모리에는 한 게임만
+들고 있으므로 오래 돌려도 되고, 중단 후 다시 실행하면 이미 저장된 게임은 건너뛴다.
+
+레코드 (RECORD_DTYPE): 게임 번호, 수 번호, 게임 길이, 보드 (main.py 형식 16칸),
+남은 말 마스크, 손에 든 말 (-1: 선택 단계), 행동할 플레이어, 고른 행동,
+루트 자식별 방문 횟수 (행동 0~15), 행동할 플레이어 관점 결과 (승 1, 무 0, 패 -1).
+에이전트는 루트에서 대칭인 행동 중 대표만 탐색하므로, 방문 횟수는 대칭 부류의 행동들에
+고르게 나누어 기록한다 (spread_visits).
+
+예: python selfplay.py data/ -n 1000 -j 4 --agent-kwargs '{"simulation_count": 2000}'
+    읽기: records = load_records('data/')
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from headless import load_agent
+from quarto_mcts import GameState
+from quarto_state import BOARD_COLS, BOARD_ROWS, NUM_CELLS, QuartoState
+from quarto_symmetry import action_orbits
+
+RECORD_DTYPE = np.dtype([
+    ('game', '<u4'),
+    ('ply', 'u1'),
+    ('length', 'u1'),  # 게임의 레코드 수 (이어쓰기 때 잘린 게임 확인용)
+    ('board', 'u1', (NUM_CELLS,)),
+    ('available', '<u2'),
+    ('selected', 'i1'),
+    ('player', 'u1'),
+    ('action', 'u1'),
+    ('visits', '<f4', (NUM_CELLS,)),  # 대칭 부류에 나눈 값이라 소수일 수 있음
+    ('outcome', 'i1'),
+])
+
+
+def shard_path(directory, worker):
+    return os.path.join(directory, f"shard_{worker:03d}.bin")
+
+
+def repair_shard(path):
+    """
+    중단으로 잘린 샤드 끝을 정리하고 온전히 저장된 게임 번호 집합 반환
+    """
+    size = os.path.getsize(path)
+    complete = size - size % RECORD_DTYPE.itemsize
+    records = np.fromfile(path, dtype=RECORD_DTYPE, count=complete // RECORD_DTYPE.itemsize)
+    if len(records):
+        # 마지막 게임은 일부만 쓰였을 수 있다
+        last = records[-1]
+        written = int(np.count_nonzero(records['game'] == last['game']))
+        if written != last['length']:
+            complete -= written * RECORD_DTYPE.itemsize
+            records = records[:len(records) - written]
+    if complete != size:
+        with open(path, 'r+b') as f:
+            f.truncate(complete)
+    return set(int(game) for game in np.unique(records['game']))
+
+
+def completed_games(directory):
+    games = set()
+    for path in glob.glob(os.path.join(directory, 'shard_*.bin')):
+        games |= repair_shard(path)
+    return games
+
+
+def load_records(directory):
+    """
+    directory 의 모든 샤드를 이어 붙인 레코드 배열 (샤드마다 메모리 매핑)
+    """
+    shards = []
+    for path in sorted(glob.glob(os.path.join(directory, 'shard_*.bin'))):
+        if os.path.getsize(path) >= RECORD_DTYPE.itemsize:
+            shards.append(np.memmap(path, dtype=RECORD_DTYPE, mode='r',
+                                    shape=(os.path.getsize(path) // RECORD_DTYPE.itemsize,)))
+    if not shards:
+        return np.empty(0, dtype=RECORD_DTYPE)
+    return shards[0] if len(shards) == 1 else np.concatenate(shards)
+
+
+def play_selfplay_game(agent, rng, random_plies=0):
+    """
+    agent.search 로 양쪽을 모두 두어 한 게임을 진행하고 (국면 목록, 승자) 반환
+    처음 random_plies 수는 다양성을 위해 무작위로 두고 기록하지 않는다.
+    """
+    state = GameState(QuartoState())
+    positions = []
+    ply = 0
+    while not state.is_terminal():
+        if ply < random_plies:
+            action = rng.choice(state.get_possible_actions())
+        else:
+            action = agent.search(state)
+            positions.append((state, action, agent.last_visits))
+        state = state.perform_action(action)
+        ply += 1
+    return positions, state.winner
+
+
+def spread_visits(state, visits):
+    """
+    대칭 부류마다 방문 횟수를 합쳐 부류의 행동들에 고르게 나눈 {행동: 방문 횟수} 반환
+    """
+    spread = {}
+    for orbit in action_orbits(state).values():
+        share = sum(visits.get(action, 0) for action in orbit) / len(orbit)
+        for action in orbit:
+            spread[action] = share
+    return spread
+
+
+def encode_game(game, positions, winner):
+    records = np.zeros(len(positions), dtype=RECORD_DTYPE)
+    for ply, (state, action, visits) in enumerate(positions):
+        record = records[ply]
+        record['game'] = game
+        record['ply'] = ply
+        record['length'] = len(positions)
+        board = state.board
+        record['board'] = [board.piece_at(cell) + 1 for cell in range(NUM_CELLS)]
+        record['available'] = board.available
+        record['selected'] = state.selected
+        record['player'] = state.player
+        record['action'] = action
+        for child_action, count in spread_visits(state, visits).items():
+            record['visits'][child_action] = count
+        record['outcome'] = 0 if winner < 0 else (1 if winner == state.player else -1)
+    return records
+
+
+def _selfplay_worker(args):
+    directory, worker, games, agent_spec, agent_kwargs, seed, random_plies, verbose = args
+    agent_class = load_agent(agent_spec)
+    board = np.zeros((BOARD_ROWS, BOARD_COLS), dtype=int)
+    written = 0
+    with open(shard_path(directory, worker), 'ab') as f:
+        for game in games:
+            random.seed(seed + game)
+            np.random.seed((seed + game) % (2 ** 32))
+            begin = time.time()
+            # 게임마다 새 에이전트 (트리/테이블을 게임 단위로 유지)
+            agent = agent_class(board=board, available_pieces=[], **agent_kwargs)
+            try:
+                positions, winner = play_selfplay_game(agent, random.Random(seed + game), random_plies)
+            finally:
+                if hasattr(agent, 'close'):
+                    agent.close()
+            f.write(encode_game(game, positions, winner).tobytes())
+            f.flush()
+            written += 1
+            if verbose:
+                print(f"game {game}: winner {winner}, {len(positions)} positions, {time.time() - begin:.1f}s")
+    return written
+
+
+def run_selfplay(directory, games, jobs=1, agent_spec='machines_p1:P1', agent_kwargs=None, seed=0,
+                 random_plies=2, verbose=False):
+    """
+    아직 저장되지 않은 게임 번호만 진행하고 새로 저장한 게임 수 반환
+    """
+    os.makedirs(directory, exist_ok=True)
+    done = completed_games(directory)
+    pending = [game for game in range(games) if game not in done]
+    jobs = max(1, min(jobs, len(pending)))
+    tasks = [
+        (directory, worker, pending[worker::jobs], agent_spec, agent_kwargs or {}, seed, random_plies, verbose)
+        for worker in range(jobs)
+    ]
+    if jobs <= 1:
+        return sum(_selfplay_worker(task) for task in tasks)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return sum(executor.map(_selfplay_worker, tasks))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate Quarto self-play records")
+    parser.add_argument('directory', help="output directory for shard_*.bin files")
+    parser.add_argument('-n', '--games', type=int, default=100, help="total games (already saved ones are skipped)")
+    parser.add_argument('-j', '--jobs', type=int, default=1, help="number of parallel processes")
+    parser.add_argument('--agent', default='machines_p1:P1', help="agent as module:Class")
+    parser.add_argument('--agent-kwargs', type=json.loads, default={}, help="JSON constructor kwargs for the agent")
+    parser.add_argument('--random-plies', type=int, default=2, help="random opening actions per game")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-v', '--verbose', action='store_true')
+    args = parser.parse_args(argv)
+
+    begin = time.time()
+    written = run_selfplay(args.directory, args.games, args.jobs, args.agent, args.agent_kwargs, args.seed,
+                           args.random_plies, args.verbose)
+    records = load_records(args.directory)
+    print(f"{written} new games ({time.time() - begin:.0f}s), {len(records)} positions in {args.directory}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+테스트용 기준 구현
+
+승리 판정은 원래 main.py 의 check_line / check_2x2_subgrid_win 을 그대로 옮긴 것이고,
+완전 탐색은 가지치기 없이 모든 말과 칸을 시도한다.
+"""
+import numpy as np
+
+from quarto_state import BOARD_COLS, BOARD_ROWS, PIECES, QuartoState, cell_to_rc
+
+
+def check_line(line):
+    if 0 in line:
+        return False  # Incomplete line
+    characteristics = np.array([PIECES[piece_idx - 1] for piece_idx in line])
+    for i in range(4):  # Check each characteristic (I/E, N/S, T/F, P/J)
+        if len(set(characteristics[:, i])) == 1:  # All share the same characteristic
+            return True
+    return False
+
+
+def check_2x2_subgrid_win(board):
+    for r in range(BOARD_ROWS - 1):
+        for c in range(BOARD_COLS - 1):
+            subgrid = [board[r][c], board[r][c+1], board[r+1][c], board[r+1][c+1]]
+            if 0 not in subgrid:  # All cells must be filled
+                characteristics = [PIECES[idx - 1] for idx in subgrid]
+                for i in range(4):  # Check each characteristic (I/E, N/S, T/F, P/J)
+                    if len(set(char[i] for char in characteristics)) == 1:  # All share the same characteristic
+                        return True
+    return False
+
+
+def check_win(board):
+    # Check rows, columns, and diagonals
+    for col in range(BOARD_COLS):
+        if check_line([board[row][col] for row in range(BOARD_ROWS)]):
+            return True
+
+    for row in range(BOARD_ROWS):
+        if check_line([board[row][col] for col in range(BOARD_COLS)]):
+            return True
+
+    if check_line([board[i][i] for i in range(BOARD_ROWS)]) or check_line([board[i][BOARD_ROWS - i - 1] for i in range(BOARD_ROWS)]):
+        return True
+
+    # Check 2x2 sub-grids
+    if check_2x2_subgrid_win(board):
+        return True
+
+    return False
+
+
+def random_position(rng, num_placed, avoid_win=True):
+    """
+    말을 무작위로 num_placed 개 놓은 (QuartoState, main.py 형식 보드)
+    avoid_win 이면 놓는 동안 승리가 생기지 않는 수만 고른다 (막히면 None)
+    """
+    state = QuartoState()
+    board = np.zeros((BOARD_ROWS, BOARD_COLS), dtype=int)
+    for _ in range(num_placed):
+        moves = [(cell, piece_id) for cell in state.empty_cells() for piece_id in state.available_pieces()]
+        rng.shuffle(moves)
+        for cell, piece_id in moves:
+            row, col = cell_to_rc(cell)
+            board[row][col] = piece_id + 1
+            if not avoid_win or not check_win(board):
+                state = state.place(cell, piece_id)
+                break
+            board[row][col] = 0
+        else:
+            return None
+    return state, board
+
+
+def brute_force_value(state, selected):
+    """
+    차례인 플레이어 관점의 게임 이론 값 (승 1, 무 0, 패 -1)
+    selected 가 -1 이면 말을 고르는 단계, 아니면 selected 를 놓는 단계
+    """
+    if selected < 0:
+        # 말을 건네면 상대가 놓는다
+        return max(-brute_force_value(state, piece_id) for piece_id in state.available_pieces())
+    board = state.to_board()
+    best = -1
+    for cell in state.empty_cells():
+        row, col = cell_to_rc(cell)
+        board[row][col] = selected + 1
+        if check_win(board):
+            return 1
+        board[row][col] = 0
+        child = state.place(cell, selected)
+        value = 0 if child.is_full() else brute_force_value(child, -1)
+        best = max(best, value)
+    return best
+
@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+from quarto_book import BOOK_MAGIC, PackedTable, pack_entry, unpack_entry, write_table
+
+
+def test_table_round_trip(tmp_path):
+    rng = random.Random(0)
+    entries = {rng.getrandbits(64): pack_entry(rng.randrange(16), rng.randrange(4)) for _ in range(1000)}
+    path = str(tmp_path / 'table.bin')
+    write_table(path, BOOK_MAGIC, 7, entries)
+
+    table = PackedTable(path, BOOK_MAGIC)
+    assert table.param == 7
+    assert len(table) == len(entries)
+    for key, value in entries.items():
+        assert table.get(key) == value
+    for _ in range(100):
+        key = rng.getrandbits(64)
+        if key not in entries:
+            assert table.get(key) is None
+
+
+def test_empty_table(tmp_path):
+    path = str(tmp_path / 'empty.bin')
+    write_table(path, BOOK_MAGIC, 0, {})
+    table = PackedTable(path, BOOK_MAGIC)
+    assert len(table) == 0
+    assert table.get(12345) is None
+
+
+def test_wrong_magic(tmp_path):
+    path = str(tmp_path / 'table.bin')
+    write_table(path, b'XXXX', 0, {1: 2})
+    with pytest.raises(ValueError):
+        PackedTable(path, BOOK_MAGIC).get(1)
+
+
+def test_pack_entry():
+    for action in range(16):
+        for value_code in range(4):
+            assert unpack_entry(pack_entry(action, value_code)) == (action, value_code)
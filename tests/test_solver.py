@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+from quarto_mcts import GameState
+from quarto_solver import EndgameSolver
+
+from tests.reference import brute_force_value, random_position
+
+
+def small_positions(seed, num_empty, count):
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        position = random_position(rng, 16 - num_empty)
+        if position is None:
+            continue
+        state, _ = position
+        selected = rng.choice([-1] + state.available_pieces())
+        positions.append(GameState(state, selected))
+    return positions
+
+
+@pytest.mark.parametrize('num_empty', [2, 3, 4, 5, 6])
+def test_solver_matches_brute_force(num_empty):
+    solver = EndgameSolver()
+    for state in small_positions(num_empty, num_empty, 25):
+        value, action = solver.solve(state)
+        assert value == brute_force_value(state.board, state.selected)
+        assert action in state.board.empty_cells() if state.selected >= 0 else action in state.board.available_pieces()
+        # 고른 행동이 실제로 그 값을 얻는지 확인
+        if state.selected >= 0:
+            child = state.perform_action(action)
+            if child.winner < 0:
+                child_value = 0 if child.board.is_full() else brute_force_value(child.board, -1)
+                assert child_value == value
+        else:
+            assert -brute_force_value(state.board, action) == value
+
+
+def test_solver_time_limit():
+    state = small_positions(0, 12, 1)[0]
+    assert EndgameSolver().solve(state, time_limit=0.0) is None
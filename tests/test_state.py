@@ -0,0 +1,44 @@
+import random
+
+import pytest
+
+from quarto_state import NUM_CELLS, QuartoState, cell_to_rc
+
+from tests.reference import check_win, random_position
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_has_win_matches_check_win(seed):
+    # 승리가 생겨도 계속 놓으면서 매 수마다 비교
+    rng = random.Random(seed)
+    state, board = random_position(rng, 0)
+    for _ in range(NUM_CELLS):
+        cell = rng.choice(state.empty_cells())
+        piece_id = rng.choice(state.available_pieces())
+        state = state.place(cell, piece_id)
+        row, col = cell_to_rc(cell)
+        board[row][col] = piece_id + 1
+        assert state.has_win() == check_win(board)
+        assert QuartoState.from_board(board) == state
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_unsafe_pieces_matches_check_win(seed):
+    rng = random.Random(seed)
+    for num_placed in range(4, 13):
+        position = random_position(rng, num_placed)
+        if position is None:
+            continue
+        state, board = position
+        expected = 0
+        for piece_id in state.available_pieces():
+            for cell in state.empty_cells():
+                row, col = cell_to_rc(cell)
+                board[row][col] = piece_id + 1
+                won = check_win(board)
+                board[row][col] = 0
+                if won:
+                    expected |= 1 << piece_id
+                    break
+        assert state.unsafe_pieces() == expected
+        assert state.safe_pieces() == state.available & ~expected
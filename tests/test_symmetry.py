@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+from quarto_mcts import GameState
+from quarto_state import QuartoState, iter_bits
+from quarto_symmetry import (
+    BOARD_SYMMETRIES, PIECE_PERMS, action_orbits, canonical_actions, canonical_key, inverse_transform_cell,
+    inverse_transform_piece, transform_cell, transform_piece,
+)
+
+from tests.reference import random_position
+
+
+def random_transform(rng):
+    return rng.randrange(len(BOARD_SYMMETRIES)), rng.randrange(len(PIECE_PERMS)), rng.randrange(16)
+
+
+def apply_transform(state, transform):
+    result = QuartoState()
+    for cell in iter_bits(state.occupied):
+        result = result.place(transform_cell(cell, transform), transform_piece(state.piece_at(cell), transform))
+    return result
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_canonical_key_invariant(seed):
+    rng = random.Random(seed)
+    state, _ = random_position(rng, rng.randrange(0, 12), avoid_win=False)
+    selected = rng.choice(state.available_pieces())
+    key, _ = canonical_key(state, selected)
+    for _ in range(10):
+        transform = random_transform(rng)
+        moved = apply_transform(state, transform)
+        assert canonical_key(moved, transform_piece(selected, transform))[0] == key
+
+
+def test_transform_round_trip():
+    rng = random.Random(0)
+    for _ in range(50):
+        transform = random_transform(rng)
+        for value in range(16):
+            assert inverse_transform_cell(transform_cell(value, transform), transform) == value
+            assert inverse_transform_piece(transform_piece(value, transform), transform) == value
+
+
+def test_action_orbits_partition_actions():
+    rng = random.Random(1)
+    for _ in range(20):
+        state, _ = random_position(rng, rng.randrange(0, 8))
+        game = GameState(state, rng.choice([-1] + state.available_pieces()))
+        orbits = action_orbits(game)
+        assert sorted(action for orbit in orbits.values() for action in orbit) == game.get_possible_actions()
+        assert list(orbits) == canonical_actions(game)
+        for orbit in orbits.values():
+            keys = {canonical_key(child.board, child.selected)[0]
+                    for child in (game.perform_action(action) for action in orbit)}
+            assert len(keys) == 1
+
+
+def test_empty_board_collapses():
+    # 빈 보드에서는 어떤 말을 줘도 대칭으로 같다
+    assert len(canonical_actions(GameState(QuartoState()))) == 1
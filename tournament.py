@@ -0,0 +1,139 @@
+"""
+두 에이전트의 대국을 여러 번 병렬로 진행하고 승/무/패를 집계하는 CLI
+
+예: python tournament.py machines_p1:P1 machines_p2:P2 -n 100 -j 4
+짝수 번째 게임은 A 가 Player 1 (먼저 말을 받아 놓는 쪽), 홀수 번째는 B 가 Player 1 이다.
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from headless import load_agent, play_game
+
+Z_95 = 1.959964
+
+
+def wilson_interval(successes, n, z=Z_95):
+    """
+    비율 successes / n 의 Wilson 신뢰 구간
+    """
+    if n == 0:
+        return 0.0, 1.0
+    p = successes / n
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return center - half, center + half
+
+
+def score_interval(wins, draws, losses, z=Z_95):
+    """
+    점수(승 1, 무 0.5, 패 0) 평균과 정규 근사 신뢰 구간
+    """
+    n = wins + draws + losses
+    if n == 0:
+        return 0.5, 0.0, 1.0
+    mean = (wins + 0.5 * draws) / n
+    variance = (wins * (1 - mean) ** 2 + draws * (0.5 - mean) ** 2 + losses * mean ** 2) / n
+    half = z * math.sqrt(variance / n)
+    return mean, max(0.0, mean - half), min(1.0, mean + half)
+
+
+def _run_game(args):
+    index, spec_a, spec_b, kwargs_a, kwargs_b, seed, verbose = args
+    random.seed(seed)
+    np.random.seed(seed % (2 ** 32))
+    a_first = index % 2 == 0
+    players = {1: load_agent(spec_a), 2: load_agent(spec_b)} if a_first else {1: load_agent(spec_b), 2: load_agent(spec_a)}
+    kwargs = {1: kwargs_a, 2: kwargs_b} if a_first else {1: kwargs_b, 2: kwargs_a}
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    with output:
+        result = play_game(players, kwargs)
+    seat_a = 1 if a_first else 2
+    if result['winner'] is None:
+        outcome = 'draw'
+    else:
+        outcome = 'win' if result['winner'] == seat_a else 'loss'
+    return {
+        'game': index,
+        'a_seat': seat_a,
+        'outcome': outcome,
+        'forfeit': None if result['forfeit'] is None else ('a' if result['forfeit'] == seat_a else 'b'),
+        'moves': result['moves'],
+        'time_a': result['time'][seat_a],
+        'time_b': result['time'][3 - seat_a],
+    }
+
+
+def run_tournament(spec_a, spec_b, games, jobs=1, kwargs_a=None, kwargs_b=None, seed=0, verbose=False):
+    """
+    A 와 B 를 games 번 대국시키고 게임별 결과 리스트 반환 (A 관점)
+    """
+    tasks = [(i, spec_a, spec_b, kwargs_a or {}, kwargs_b or {}, seed + i, verbose) for i in range(games)]
+    if jobs <= 1:
+        return [_run_game(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(_run_game, tasks))
+
+
+def summarize(results):
+    wins = sum(r['outcome'] == 'win' for r in results)
+    draws = sum(r['outcome'] == 'draw' for r in results)
+    losses = sum(r['outcome'] == 'loss' for r in results)
+    n = len(results)
+    mean, low, high = score_interval(wins, draws, losses)
+    return {
+        'games': n,
+        'wins': wins,
+        'draws': draws,
+        'losses': losses,
+        'win_rate': wins / n if n else 0.0,
+        'win_rate_ci95': wilson_interval(wins, n),
+        'score': mean,
+        'score_ci95': (low, high),
+        'forfeits_a': sum(r['forfeit'] == 'a' for r in results),
+        'forfeits_b': sum(r['forfeit'] == 'b' for r in results),
+        'avg_time_a': sum(r['time_a'] for r in results) / n if n else 0.0,
+        'avg_time_b': sum(r['time_b'] for r in results) / n if n else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run headless Quarto matches between two agents")
+    parser.add_argument('agent_a', help="agent A as module:Class (e.g. machines_p1:P1)")
+    parser.add_argument('agent_b', help="agent B as module:Class (e.g. machines_p2:P2)")
+    parser.add_argument('-n', '--games', type=int, default=10)
+    parser.add_argument('-j', '--jobs', type=int, default=1, help="number of parallel processes")
+    parser.add_argument('--a-kwargs', type=json.loads, default={}, help="JSON constructor kwargs for agent A")
+    parser.add_argument('--b-kwargs', type=json.loads, default={}, help="JSON constructor kwargs for agent B")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help="write per-game results and the summary to this file")
+    parser.add_argument('-v', '--verbose', action='store_true', help="show agent output")
+    args = parser.parse_args(argv)
+
+    results = run_tournament(args.agent_a, args.agent_b, args.games, args.jobs,
+                             args.a_kwargs, args.b_kwargs, args.seed, args.verbose)
+    summary = summarize(results)
+    low, high = summary['win_rate_ci95']
+    score_low, score_high = summary['score_ci95']
+    print(f"{args.agent_a} vs {args.agent_b}: {summary['games']} games")
+    print(f"  W/D/L: {summary['wins']}/{summary['draws']}/{summary['losses']}")
+    print(f"  win rate: {summary['win_rate']:.3f} (95% CI {low:.3f}-{high:.3f})")
+    print(f"  score: {summary['score']:.3f} (95% CI {score_low:.3f}-{score_high:.3f})")
+    print(f"  forfeits A/B: {summary['forfeits_a']}/{summary['forfeits_b']}")
+    print(f"  avg time per game A/B: {summary['avg_time_a']:.2f}s / {summary['avg_time_b']:.2f}s")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'summary': summary, 'games': results}, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())